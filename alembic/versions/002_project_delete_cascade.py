@@ -0,0 +1,46 @@
+"""Cascade task deletes in the database and allow hiding projects
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+# Names SQLite's unnamed foreign keys the way PostgreSQL names them, so batch
+# mode can find task_project_id_fkey on both
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+def upgrade():
+    # Let the database remove a project's tasks instead of the ORM (batch
+    # mode: SQLite can't alter constraints, so the table is rebuilt there)
+    with op.batch_alter_table('task', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint('task_project_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'task_project_id_fkey', 'project',
+            ['project_id'], ['id'], ondelete='CASCADE',
+        )
+    # Cascades and batched deletes look tasks up by project
+    op.create_index(op.f('ix_task_project_id'), 'task', ['project_id'], unique=False)
+
+    # Projects queued for background deletion are hidden immediately
+    op.add_column('project', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('project', 'deleted_at')
+    op.drop_index(op.f('ix_task_project_id'), table_name='task')
+    with op.batch_alter_table('task', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint('task_project_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'task_project_id_fkey', 'project',
+            ['project_id'], ['id'],
+        )
@@ -0,0 +1,38 @@
+"""Add time-ordered task reminders
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'taskreminder',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.Enum('DUE_SOON', 'OVERDUE', name='reminderkind'), nullable=False),
+        sa.Column('fire_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['task.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_taskreminder_id'), 'taskreminder', ['id'], unique=False)
+    op.create_index(op.f('ix_taskreminder_task_id'), 'taskreminder', ['task_id'], unique=False)
+    op.create_index(op.f('ix_taskreminder_fire_at'), 'taskreminder', ['fire_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_taskreminder_fire_at'), table_name='taskreminder')
+    op.drop_index(op.f('ix_taskreminder_task_id'), table_name='taskreminder')
+    op.drop_index(op.f('ix_taskreminder_id'), table_name='taskreminder')
+    op.drop_table('taskreminder')
+    sa.Enum(name='reminderkind').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,48 @@
+"""Add archive table for completed tasks
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'archivedtask',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', postgresql.ENUM('TODO', 'IN_PROGRESS', 'DONE', name='taskstatus', create_type=False), nullable=False),
+        sa.Column('priority', postgresql.ENUM('LOW', 'MEDIUM', 'HIGH', name='taskpriority', create_type=False), nullable=False),
+        sa.Column('due_date', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('assigned_user_id', sa.Integer(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['assigned_user_id'], ['user.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archivedtask_id'), 'archivedtask', ['id'], unique=False)
+    op.create_index(op.f('ix_archivedtask_project_id'), 'archivedtask', ['project_id'], unique=False)
+
+    # Lets the archival job find old DONE tasks without scanning the table
+    op.create_index('ix_task_status_updated_at', 'task', ['status', 'updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_status_updated_at', table_name='task')
+    op.drop_index(op.f('ix_archivedtask_project_id'), table_name='archivedtask')
+    op.drop_index(op.f('ix_archivedtask_id'), table_name='archivedtask')
+    op.drop_table('archivedtask')
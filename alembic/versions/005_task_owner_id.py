@@ -0,0 +1,84 @@
+"""Denormalize the project owner onto tasks
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# Rows updated per backfill transaction
+BATCH_SIZE = 10000
+
+SET_OWNER = (
+    "UPDATE {table} SET owner_id = "
+    "(SELECT project.owner_id FROM project WHERE project.id = {table}.project_id)"
+)
+
+
+def _backfill(table):
+    """
+    Copy project.owner_id onto `table` in id ranges, committing after each
+    range so no long-running transaction holds row locks on the table.
+    """
+    context = op.get_context()
+    if context.as_sql:
+        op.execute(SET_OWNER.format(table=table))
+        return
+    connection = op.get_bind()
+    with context.autocommit_block():
+        max_id = connection.execute(sa.text(f"SELECT max(id) FROM {table}")).scalar() or 0
+        for start in range(1, max_id + 1, BATCH_SIZE):
+            connection.execute(
+                sa.text(SET_OWNER.format(table=table) + " WHERE id BETWEEN :start AND :end"),
+                {"start": start, "end": start + BATCH_SIZE - 1},
+            )
+        # Rows written by the previous release while the backfill ran
+        connection.execute(sa.text(SET_OWNER.format(table=table) + " WHERE owner_id IS NULL"))
+
+
+def upgrade():
+    op.add_column('task', sa.Column('owner_id', sa.Integer(), nullable=True))
+    op.add_column('archivedtask', sa.Column('owner_id', sa.Integer(), nullable=True))
+    _backfill('task')
+    _backfill('archivedtask')
+
+    with op.get_context().autocommit_block():
+        # Task lists are scoped to the owner and usually filtered by status
+        op.create_index(
+            'ix_task_owner_id_status_due_date', 'task', ['owner_id', 'status', 'due_date'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_archivedtask_owner_id'), 'archivedtask', ['owner_id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        # Looks up a user's hidden projects when filtering their tasks
+        op.create_index(
+            op.f('ix_project_owner_id'), 'project', ['owner_id'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+    # Batch mode: SQLite rebuilds the tables, PostgreSQL gets plain ALTERs
+    for table in ('task', 'archivedtask'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('owner_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.create_foreign_key(f'{table}_owner_id_fkey', 'user', ['owner_id'], ['id'])
+
+
+def downgrade():
+    for table in ('archivedtask', 'task'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'{table}_owner_id_fkey', type_='foreignkey')
+    op.drop_index(op.f('ix_project_owner_id'), table_name='project')
+    op.drop_index(op.f('ix_archivedtask_owner_id'), table_name='archivedtask')
+    op.drop_index('ix_task_owner_id_status_due_date', table_name='task')
+    op.drop_column('archivedtask', 'owner_id')
+    op.drop_column('task', 'owner_id')
@@ -0,0 +1,44 @@
+"""Track bulk task imports
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'taskimport',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('format', sa.String(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'DONE', 'FAILED', name='importstatus'), nullable=False),
+        sa.Column('file_path', sa.String(), nullable=True),
+        sa.Column('bytes_total', sa.BigInteger(), nullable=False),
+        sa.Column('bytes_processed', sa.BigInteger(), nullable=False),
+        sa.Column('rows_imported', sa.Integer(), nullable=False),
+        sa.Column('rows_failed', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_taskimport_id'), 'taskimport', ['id'], unique=False)
+    op.create_index(op.f('ix_taskimport_owner_id'), 'taskimport', ['owner_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_taskimport_owner_id'), table_name='taskimport')
+    op.drop_index(op.f('ix_taskimport_id'), table_name='taskimport')
+    op.drop_table('taskimport')
+    sa.Enum(name='importstatus').drop(op.get_bind(), checkfirst=True)
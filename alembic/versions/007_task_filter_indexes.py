@@ -0,0 +1,34 @@
+"""Index task list filters on assignee and update time
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        # ?assigned_user_id= and the per-assignee overdue summary
+        op.create_index(
+            op.f('ix_task_assigned_user_id'), 'task', ['assigned_user_id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        # ?updated_since= range scans within one owner's tasks
+        op.create_index(
+            'ix_task_owner_id_updated_at', 'task', ['owner_id', 'updated_at'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index('ix_task_owner_id_updated_at', table_name='task')
+    op.drop_index(op.f('ix_task_assigned_user_id'), table_name='task')
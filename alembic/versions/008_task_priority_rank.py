@@ -0,0 +1,74 @@
+"""Store a numeric priority rank for urgency sorting
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Rows updated per backfill transaction
+BATCH_SIZE = 10000
+
+# Must match app.models.task.PRIORITY_RANK
+SET_RANK = (
+    "UPDATE {table} SET priority_rank = CASE priority "
+    "WHEN 'LOW' THEN 1 WHEN 'MEDIUM' THEN 2 WHEN 'HIGH' THEN 3 END"
+)
+
+
+def _backfill(table):
+    """
+    Fill priority_rank in id ranges, committing after each range.
+    """
+    context = op.get_context()
+    if context.as_sql:
+        op.execute(SET_RANK.format(table=table))
+        return
+    connection = op.get_bind()
+    with context.autocommit_block():
+        max_id = connection.execute(sa.text(f"SELECT max(id) FROM {table}")).scalar() or 0
+        for start in range(1, max_id + 1, BATCH_SIZE):
+            connection.execute(
+                sa.text(SET_RANK.format(table=table) + " WHERE id BETWEEN :start AND :end"),
+                {"start": start, "end": start + BATCH_SIZE - 1},
+            )
+        # Rows written by the previous release while the backfill ran
+        connection.execute(sa.text(SET_RANK.format(table=table) + " WHERE priority_rank IS NULL"))
+
+
+def upgrade():
+    op.add_column('task', sa.Column('priority_rank', sa.SmallInteger(), nullable=True))
+    op.add_column('archivedtask', sa.Column('priority_rank', sa.SmallInteger(), nullable=True))
+    _backfill('task')
+    _backfill('archivedtask')
+
+    with op.get_context().autocommit_block():
+        # sort=priority pages per owner or project, id breaking ties
+        op.create_index(
+            'ix_task_owner_id_priority_rank_id', 'task', ['owner_id', 'priority_rank', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_task_project_id_priority_rank_id', 'task', ['project_id', 'priority_rank', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+    # Batch mode: SQLite rebuilds the tables, PostgreSQL gets plain ALTERs
+    for table in ('task', 'archivedtask'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('priority_rank', existing_type=sa.SmallInteger(), nullable=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_project_id_priority_rank_id', table_name='task')
+    op.drop_index('ix_task_owner_id_priority_rank_id', table_name='task')
+    op.drop_column('archivedtask', 'priority_rank')
+    op.drop_column('task', 'priority_rank')
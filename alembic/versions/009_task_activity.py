@@ -0,0 +1,38 @@
+"""Record task change history
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'taskactivity',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.Enum('CREATED', 'UPDATED', 'DELETED', name='activityaction'), nullable=False),
+        sa.Column('changes', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.ForeignKeyConstraint(['actor_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_taskactivity_task_id_id', 'taskactivity', ['task_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_taskactivity_task_id_id', table_name='taskactivity')
+    op.drop_table('taskactivity')
+    sa.Enum(name='activityaction').drop(op.get_bind(), checkfirst=True)
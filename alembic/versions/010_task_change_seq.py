@@ -0,0 +1,120 @@
+"""Track task changes for delta sync
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.task_sync import POSTGRESQL_TRIGGERS, SQLITE_TRIGGERS
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Rows updated per backfill transaction
+BATCH_SIZE = 10000
+
+# Existing tasks are numbered by id, so every owner's counter starts at max(id)
+SET_SEQ = "UPDATE task SET change_seq = id"
+
+
+def _backfill():
+    """
+    Fill change_seq in id ranges, committing after each range.
+    """
+    context = op.get_context()
+    if context.as_sql:
+        op.execute(SET_SEQ)
+        return
+    connection = op.get_bind()
+    with context.autocommit_block():
+        max_id = connection.execute(sa.text("SELECT max(id) FROM task")).scalar() or 0
+        for start in range(1, max_id + 1, BATCH_SIZE):
+            connection.execute(
+                sa.text(SET_SEQ + " WHERE id BETWEEN :start AND :end"),
+                {"start": start, "end": start + BATCH_SIZE - 1},
+            )
+        # Rows written by the previous release while the backfill ran
+        connection.execute(sa.text(SET_SEQ + " WHERE change_seq IS NULL"))
+
+
+def upgrade():
+    op.add_column('task', sa.Column('change_seq', sa.BigInteger(), nullable=True))
+    op.create_table(
+        'taskchangecounter',
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('owner_id')
+    )
+    op.create_table(
+        'tasktombstone',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('change_seq', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_tasktombstone_owner_id_change_seq', 'tasktombstone', ['owner_id', 'change_seq'], unique=False,
+    )
+    op.create_index('ix_tasktombstone_deleted_at', 'tasktombstone', ['deleted_at'], unique=False)
+    _backfill()
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_owner_id_change_seq', 'task', ['owner_id', 'change_seq'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+    if op.get_context().dialect.name != 'postgresql':
+        # SQLite rebuilds the table to change the column, which would drop
+        # its triggers, so they come last
+        op.execute(
+            'INSERT INTO taskchangecounter (owner_id, seq) '
+            'SELECT id, (SELECT coalesce(max(id), 0) FROM task) FROM "user"'
+        )
+        op.execute(SET_SEQ + " WHERE change_seq IS NULL")
+        with op.batch_alter_table('task') as batch_op:
+            batch_op.alter_column('change_seq', existing_type=sa.BigInteger(), nullable=False, server_default='0')
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+        return
+
+    # One transaction: creating the triggers locks out writers until the
+    # counters are seeded and the last unnumbered rows are caught up
+    for statement in POSTGRESQL_TRIGGERS:
+        op.execute(statement)
+    op.execute(
+        'INSERT INTO taskchangecounter (owner_id, seq) '
+        'SELECT id, (SELECT coalesce(max(id), 0) FROM task) FROM "user"'
+    )
+    op.execute(SET_SEQ + " WHERE change_seq IS NULL")
+    op.alter_column('task', 'change_seq', existing_type=sa.BigInteger(), nullable=False, server_default='0')
+
+
+def downgrade():
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS task_tombstone ON task")
+        op.execute("DROP TRIGGER IF EXISTS task_change_seq ON task")
+        op.execute("DROP FUNCTION IF EXISTS task_record_tombstone()")
+        op.execute("DROP FUNCTION IF EXISTS task_set_change_seq()")
+        op.execute("DROP FUNCTION IF EXISTS task_next_change_seq(integer)")
+    else:
+        op.execute("DROP TRIGGER IF EXISTS task_tombstone")
+        op.execute("DROP TRIGGER IF EXISTS task_change_seq_update")
+        op.execute("DROP TRIGGER IF EXISTS task_change_seq_insert")
+    op.drop_index('ix_task_owner_id_change_seq', table_name='task')
+    op.drop_index('ix_tasktombstone_deleted_at', table_name='tasktombstone')
+    op.drop_index('ix_tasktombstone_owner_id_change_seq', table_name='tasktombstone')
+    op.drop_table('tasktombstone')
+    op.drop_table('taskchangecounter')
+    with op.batch_alter_table('task') as batch_op:
+        batch_op.drop_column('change_seq')
@@ -1,6 +1,9 @@
-from typing import Generator
+import ipaddress
+import math
+from functools import lru_cache
+from typing import Callable, Generator, List, Optional, Union
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
@@ -9,7 +12,8 @@ from sqlalchemy.orm import Session
 from app import models, schemas
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.rate_limit import rate_limiter
+from app.db.session import SessionLocal, get_read_session
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"/api/auth/login"
@@ -42,9 +46,30 @@ def get_current_user(
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    # Lets the session remember this user's commits for read-your-writes routing
+    db.info["user_id"] = user.id
     return user
 
 
+def get_read_db(
+    current_user: models.User = Depends(get_current_user),
+    primary: Session = Depends(get_db),
+) -> Generator:
+    """
+    Session for read-only handlers; served by a replica when one is
+    configured and the user hasn't written in the last few seconds.
+    """
+    # Authentication is done with the primary session; hand its connection
+    # back first so a read request never holds two. Closing detaches
+    # current_user without expiring it, so its loaded fields stay readable
+    primary.close()
+    db = get_read_session(user_id=current_user.id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
@@ -60,4 +85,93 @@ def get_current_active_superuser(
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def _user_id_from_token(request: Request) -> Optional[str]:
+    """
+    Read the user id from the bearer token without touching the database.
+    """
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.JWTError:
+        return None
+    return payload.get("sub")
+
+
+@lru_cache()
+def _trusted_networks() -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    return [
+        ipaddress.ip_network(proxy, strict=False)
+        for proxy in settings.TRUSTED_PROXIES
+        if proxy != "*"
+    ]
+
+
+def _in_trusted_networks(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_networks())
+
+
+def client_ip(request: Request) -> str:
+    """
+    The client's IP address. X-Forwarded-For is only believed when the
+    peer is a trusted proxy (settings.TRUSTED_PROXIES). Its hops are walked
+    from the right, skipping the listed proxy networks, and the first other
+    address wins; the hops to its left are written by the client and never
+    used. "*" trusts any peer but no hops, so the client is the address
+    the edge proxy appended.
+    """
+    host = request.client.host if request.client else "unknown"
+    if "*" not in settings.TRUSTED_PROXIES and not _in_trusted_networks(host):
+        return host
+    hops = [hop.strip() for hop in request.headers.get("X-Forwarded-For", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _in_trusted_networks(hop):
+            return hop
+    # Only trusted proxies in the chain: the request started inside it
+    return hops[0] if hops else host
+
+
+def _route_has_own_limit(request: Request) -> bool:
+    route = request.scope.get("route")
+    return any(
+        getattr(dependency.dependency, "rate_limit_name", "default") != "default"
+        for dependency in getattr(route, "dependencies", [])
+    )
+
+
+def rate_limit(name: str, by_ip: bool = False) -> Callable:
+    """
+    Dependency that applies the `name` limit from settings.RATE_LIMITS,
+    keyed by user id, or by client IP when `by_ip` is set or the request
+    has no valid token. Routes with a limit of their own aren't also
+    charged to the "default" one.
+    """
+    async def check_rate_limit(request: Request) -> None:
+        limit = settings.RATE_LIMITS.get(name)
+        if not settings.RATE_LIMIT_ENABLED or not limit:
+            return
+        if name == "default" and _route_has_own_limit(request):
+            return
+        user_id = None if by_ip else _user_id_from_token(request)
+        if user_id:
+            identity = f"user:{user_id}"
+        else:
+            identity = f"ip:{client_ip(request)}"
+        allowed, retry_after = await rate_limiter.hit(f"{name}:{identity}", limit)
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+    check_rate_limit.rate_limit_name = name
+    return check_rate_limit
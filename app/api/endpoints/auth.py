@@ -13,7 +13,11 @@ from app.core.config import settings
 router = APIRouter()
 
 
-@router.post("/login", response_model=schemas.Token)
+@router.post(
+    "/login",
+    response_model=schemas.Token,
+    dependencies=[Depends(dependencies.rate_limit("login", by_ip=True))],
+)
 def login_access_token(
     db: Session = Depends(dependencies.get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
@@ -35,7 +39,11 @@ def login_access_token(
     }
 
 
-@router.post("/register", response_model=schemas.User)
+@router.post(
+    "/register",
+    response_model=schemas.User,
+    dependencies=[Depends(dependencies.rate_limit("register", by_ip=True))],
+)
 def register_user(
     *,
     db: Session = Depends(dependencies.get_db),
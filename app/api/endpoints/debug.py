@@ -0,0 +1,56 @@
+import time
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.api import dependencies
+from app.core.config import settings
+from app.core.profiling import ProfilerBusy, SamplingProfiler
+
+router = APIRouter()
+
+
+@router.get("/profile")
+async def profile_process(
+    *,
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS, description="How long to sample"),
+    interval_ms: float = Query(10, ge=1, le=1000, description="Time between samples"),
+    memory: bool = Query(False, description="Also diff tracemalloc snapshots (slows the process while running)"),
+    include_idle: bool = Query(False, description="Keep stacks of threads waiting for work"),
+    format: str = Query("collapsed", description="collapsed (flame graph input) or json"),
+    current_user: models.User = Depends(dependencies.get_current_active_superuser),
+) -> Any:
+    """
+    Sample the stacks of every thread in the API process serving this
+    request for `seconds`. Only for superusers. With several workers,
+    each request profiles one of them (see `pid`).
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if format not in ("collapsed", "json"):
+        raise HTTPException(status_code=422, detail="Invalid format; expected collapsed or json")
+    if memory and format != "json":
+        raise HTTPException(status_code=422, detail="Memory diffs are only returned with format=json")
+
+    profiler = SamplingProfiler(interval_ms / 1000, include_idle=include_idle)
+    try:
+        # Samples from a threadpool thread, so the event loop keeps serving
+        # (and is itself sampled)
+        profile = await run_in_threadpool(profiler.run, seconds, memory, settings.PROFILER_TRACEMALLOC_FRAMES)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "json":
+        return profile.summary()
+    filename = f"profile-{profile.pid}-{int(time.time())}.folded"
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Pid": str(profile.pid),
+            "X-Profile-Samples": str(profile.samples),
+        },
+    )
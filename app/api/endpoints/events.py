@@ -0,0 +1,68 @@
+import asyncio
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from fastapi.concurrency import run_in_threadpool
+
+from app.api import dependencies
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.events import broker
+
+router = APIRouter()
+
+# EventSource can't send headers, so the token may also come as ?token=
+optional_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+
+def _authenticate(token: str) -> int:
+    """
+    Resolve the token to an active user id using a short-lived session, so
+    an open stream never holds a database connection.
+    """
+    db = SessionLocal()
+    try:
+        return dependencies.get_current_user(db=db, token=token).id
+    finally:
+        db.close()
+
+
+@router.get("/")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = Query(None, description="Access token, for clients that can't set headers"),
+    header_token: Optional[str] = Depends(optional_oauth2),
+) -> Any:
+    """
+    Server-Sent Events stream of task created/updated/deleted events for
+    the projects the current user owns.
+    """
+    access_token = header_token or token
+    if not access_token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    user_id = await run_in_threadpool(_authenticate, access_token)
+    queue = await broker.subscribe(user_id)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing idle connections
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            await broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
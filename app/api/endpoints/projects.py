@@ -1,3 +1,5 @@
+import logging
+from datetime import datetime
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -5,13 +7,18 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import dependencies
+from app.core.config import settings
+from app.services.background import enqueue
+from app.services.task_counts import invalidate_task_counts
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.Project])
 def read_projects(
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user: models.User = Depends(dependencies.get_current_active_user),
@@ -21,7 +28,10 @@ def read_projects(
     """
     projects = (
         db.query(models.Project)
-        .filter(models.Project.owner_id == current_user.id)
+        .filter(
+            models.Project.owner_id == current_user.id,
+            models.Project.deleted_at.is_(None),
+        )
         .offset(skip)
         .limit(limit)
         .all()
@@ -52,7 +62,7 @@ def create_project(
 @router.get("/{project_id}", response_model=schemas.ProjectWithTasks)
 def read_project(
     *,
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     project_id: int,
     current_user: models.User = Depends(dependencies.get_current_active_user),
 ) -> Any:
@@ -62,6 +72,7 @@ def read_project(
     project = db.query(models.Project).filter(
         models.Project.id == project_id,
         models.Project.owner_id == current_user.id,
+        models.Project.deleted_at.is_(None),
     ).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -82,6 +93,7 @@ def update_project(
     project = db.query(models.Project).filter(
         models.Project.id == project_id,
         models.Project.owner_id == current_user.id,
+        models.Project.deleted_at.is_(None),
     ).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -109,10 +121,35 @@ def delete_project(
     project = db.query(models.Project).filter(
         models.Project.id == project_id,
         models.Project.owner_id == current_user.id,
+        models.Project.deleted_at.is_(None),
     ).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    # Large projects are hidden now and emptied in batches by a Celery job
+    # so the request doesn't hold a connection and row locks for minutes
+    is_large = (
+        db.query(models.Task.id)
+        .filter(models.Task.project_id == project.id)
+        .offset(settings.PROJECT_DELETE_BACKGROUND_THRESHOLD)
+        .first()
+        is not None
+    )
+    if is_large:
+        project.deleted_at = datetime.utcnow()
+        db.add(project)
+        db.commit()
+        db.refresh(project)
+        invalidate_task_counts(current_user.id)
+        try:
+            enqueue("delete_project_in_batches", project.id)
+        except Exception:
+            # The project stays hidden; requeue_deleted_projects retries it
+            logger.exception(f"Could not queue deletion of project {project.id}")
+        return project
+
+    # Tasks go with it through ON DELETE CASCADE
     db.delete(project)
     db.commit()
+    invalidate_task_counts(current_user.id)
     return project
\ No newline at end of file
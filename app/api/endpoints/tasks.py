@@ -1,30 +1,139 @@
-from datetime import datetime
-from typing import Any, List, Optional
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import asc, desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import asc, desc, or_, select, union_all
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import dependencies
+from app.core.config import settings
 from app.models.task import TaskPriority, TaskStatus
-from app.services.tasks import notify_task_assigned, notify_task_status_changed
+from app.models.task_activity import ActivityAction
+from app.services.activity import activity_log, field_changes, task_snapshot
+from app.services.archive import archived_columns
+from app.services.background import enqueue, uses_broker
+from app.services.events import publish_task_event
+from app.services.reminders import schedule_task_reminders
+from app.services.task_import import (
+    FORMATS,
+    ImportTooLarge,
+    create_import,
+    format_from_content_type,
+    spool_upload,
+)
+from app.services.task_counts import count_tasks, invalidate_task_counts
+from app.services.task_sync import InvalidSyncToken, SyncTokenExpired, read_changes
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[schemas.Task])
+def _owned_by(model: Any, owner_id: int) -> List[Any]:
+    """
+    Criteria for `owner_id`'s visible tasks; `model` is Task or
+    ArchivedTask. Uses the denormalized owner_id, so no join with project;
+    the user's hidden (being deleted) projects are a small, indexed lookup.
+    """
+    deleted_projects = select(models.Project.id).where(
+        models.Project.owner_id == owner_id,
+        models.Project.deleted_at.is_not(None),
+    )
+    return [
+        model.owner_id == owner_id,
+        model.project_id.not_in(deleted_projects),
+    ]
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored datetimes are naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_list(values: Optional[List[str]], enum: Any, name: str) -> Optional[Tuple[Any, ...]]:
+    """
+    Parse `?name=A,B` and/or `?name=A&name=B` into a tuple of enum members.
+    """
+    if not values:
+        return None
+    try:
+        return tuple(sorted({enum(part.strip()) for value in values for part in value.split(",") if part.strip()}))
+    except ValueError:
+        allowed = ", ".join(member.value for member in enum)
+        raise HTTPException(status_code=422, detail=f"Invalid {name}; expected any of {allowed}")
+
+
+def _task_filters(
+    model: Any,
+    owner_id: int,
+    statuses: Optional[Tuple[TaskStatus, ...]],
+    priorities: Optional[Tuple[TaskPriority, ...]],
+    due_date: Optional[datetime],
+    project_id: Optional[int],
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    assigned_user_id: Optional[int] = None,
+    overdue: Optional[bool] = None,
+    now: Optional[datetime] = None,
+) -> List[Any]:
+    """
+    Filter criteria for listing tasks; `model` is Task or ArchivedTask.
+    Every criterion is a plain comparison or IN list on a column so the
+    (owner_id, status, due_date) and related indexes can serve it.
+    """
+    criteria = _owned_by(model, owner_id)
+    if overdue:
+        # Spelled as an IN list rather than != DONE so it stays an index range
+        open_statuses = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+        statuses = tuple(s for s in statuses if s in open_statuses) if statuses else open_statuses
+        criteria.append(model.due_date < now)
+    elif overdue is False:
+        criteria.append(or_(model.due_date.is_(None), model.due_date >= now, model.status == TaskStatus.DONE))
+    if statuses is not None:
+        criteria.append(model.status.in_(statuses))
+    if priorities:
+        criteria.append(model.priority.in_(priorities))
+    if due_date:
+        criteria.append(model.due_date == due_date)
+    if due_after:
+        criteria.append(model.due_date >= due_after)
+    if due_before:
+        criteria.append(model.due_date < due_before)
+    if updated_since:
+        criteria.append(model.updated_at >= updated_since)
+    if assigned_user_id:
+        criteria.append(model.assigned_user_id == assigned_user_id)
+    if project_id:
+        criteria.append(model.project_id == project_id)
+    return criteria
+
+
+@router.get(
+    "/",
+    response_model=Union[List[schemas.Task], schemas.TaskPage],
+    dependencies=[Depends(dependencies.rate_limit("tasks_list"))],
+)
 def read_tasks(
     *,
-    db: Session = Depends(dependencies.get_db),
-    status: Optional[TaskStatus] = None,
-    priority: Optional[TaskPriority] = None,
+    db: Session = Depends(dependencies.get_read_db),
+    status: Optional[List[str]] = Query(None, description="One or more statuses, e.g. TODO,IN_PROGRESS"),
+    priority: Optional[List[str]] = Query(None, description="One or more priorities, e.g. HIGH,MEDIUM"),
     due_date: Optional[datetime] = None,
+    due_after: Optional[datetime] = Query(None, description="Due at or after this time"),
+    due_before: Optional[datetime] = Query(None, description="Due before this time"),
+    updated_since: Optional[datetime] = Query(None, description="Updated at or after this time"),
+    overdue: Optional[bool] = Query(None, description="Past due and not DONE (or the opposite when false)"),
+    assigned_user_id: Optional[int] = None,
     project_id: Optional[int] = None,
-    sort: Optional[str] = Query(None, description="Sort by: priority, due_date"),
+    include_archived: bool = Query(False, description="Also return archived DONE tasks"),
+    sort: Optional[str] = Query(None, description="Sort by: priority (by urgency), due_date"),
     sort_order: Optional[str] = Query("asc", description="Sort order: asc, desc"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    envelope: bool = Query(False, description="Return {items, total, ...} instead of a bare list"),
     current_user: models.User = Depends(dependencies.get_current_active_user),
 ) -> Any:
     """
@@ -32,40 +141,72 @@ def read_tasks(
     """
     # Calculate offset for pagination
     skip = (page - 1) * limit
-    
-    # Start building the query
-    query = db.query(models.Task).join(models.Project)
-    
-    # Apply filters
-    query = query.filter(models.Project.owner_id == current_user.id)
-    
-    if status:
-        query = query.filter(models.Task.status == status)
-    if priority:
-        query = query.filter(models.Task.priority == priority)
-    if due_date:
-        query = query.filter(models.Task.due_date == due_date)
-    if project_id:
-        query = query.filter(models.Task.project_id == project_id)
-    
-    # Apply sorting
-    if sort:
-        sort_column = None
-        if sort == "priority":
-            sort_column = models.Task.priority
-        elif sort == "due_date":
-            sort_column = models.Task.due_date
-        
-        if sort_column:
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
-    
-    # Apply pagination
-    tasks = query.offset(skip).limit(limit).all()
-    
-    return tasks
+    filters = dict(
+        statuses=_parse_list(status, TaskStatus, "status"),
+        priorities=_parse_list(priority, TaskPriority, "priority"),
+        due_date=_utc(due_date),
+        project_id=project_id,
+        due_before=_utc(due_before),
+        due_after=_utc(due_after),
+        updated_since=_utc(updated_since),
+        assigned_user_id=assigned_user_id,
+        overdue=overdue,
+        now=datetime.utcnow() if overdue is not None else None,
+    )
+    # Priority sorts by urgency (LOW < MEDIUM < HIGH), not by label
+    sort_name = {"priority": "priority_rank", "due_date": "due_date"}.get(sort)
+    direction = desc if sort_order.lower() == "desc" else asc
+
+    if include_archived:
+        # Page over live and archived tasks together
+        columns = archived_columns()
+        live = (
+            select(*[getattr(models.Task, name) for name in columns])
+            .where(*_task_filters(models.Task, current_user.id, **filters))
+        )
+        archived = (
+            select(*[getattr(models.ArchivedTask, name) for name in columns])
+            .where(*_task_filters(models.ArchivedTask, current_user.id, **filters))
+        )
+        combined = union_all(live, archived).subquery()
+        statement = select(combined)
+        if sort_name:
+            statement = statement.order_by(direction(combined.c[sort_name]), direction(combined.c.id))
+        tasks = db.execute(statement.offset(skip).limit(limit)).all()
+        count_statement = select(combined.c.id)
+    else:
+        # Start building the query
+        query = db.query(models.Task)
+
+        # Apply filters
+        query = query.filter(*_task_filters(models.Task, current_user.id, **filters))
+        count_statement = query.with_entities(models.Task.id).statement
+
+        # Apply sorting
+        if sort_name:
+            # id breaks ties so pages don't overlap; same direction keeps it one index scan
+            query = query.order_by(direction(getattr(models.Task, sort_name)), direction(models.Task.id))
+
+        # Apply pagination
+        tasks = query.offset(skip).limit(limit).all()
+
+    if not envelope:
+        return tasks
+
+    total, is_exact = count_tasks(
+        db,
+        current_user.id,
+        # `now` changes every request; cache overdue counts by the flag instead
+        tuple(sorted((key, value) for key, value in filters.items() if key != "now")) + (include_archived,),
+        count_statement,
+    )
+    return {
+        "items": tasks,
+        "total": total,
+        "total_is_exact": is_exact,
+        "page": page,
+        "limit": limit,
+    }
 
 
 @router.post("/", response_model=schemas.Task)
@@ -82,20 +223,36 @@ def create_task(
     project = db.query(models.Project).filter(
         models.Project.id == task_in.project_id,
         models.Project.owner_id == current_user.id,
+        models.Project.deleted_at.is_(None),
     ).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Create task
-    task = models.Task(**task_in.dict())
+    task_data = task_in.dict()
+    task_data["due_date"] = _utc(task_data.get("due_date"))
+    task = models.Task(**task_data, owner_id=project.owner_id)
     db.add(task)
+    db.flush()
+    schedule_task_reminders(db, task)
     db.commit()
     db.refresh(task)
+
+    activity_log.record(
+        task.id, task.owner_id, current_user.id, ActivityAction.CREATED,
+        task_snapshot(task, ActivityAction.CREATED),
+    )
+    invalidate_task_counts(current_user.id)
+    publish_task_event(
+        "task.created",
+        current_user.id,
+        {"task": schemas.Task.model_validate(task).model_dump(mode="json")},
+    )
     
     # Send notification if task is assigned to a user
     if task.assigned_user_id:
         try:
-            notify_task_assigned.delay(task.id)
+            enqueue("notify_task_assigned", task.id)
         except Exception as e:
             # Log the error but don't fail the task creation
             print(f"Warning: Could not send notification: {str(e)}")
@@ -103,6 +260,108 @@ def create_task(
     return task
 
 
+def _queue_import(db: Session, job: models.TaskImport, size: int) -> models.TaskImport:
+    db.add(job)
+    job.bytes_total = size
+    db.commit()
+    db.refresh(job)
+    enqueue("import_tasks", job.id)
+    return job
+
+
+def _fail_import(db: Session, job: models.TaskImport, message: str) -> None:
+    db.add(job)
+    job.status = models.ImportStatus.FAILED
+    job.errors = [{"line": None, "error": message}]
+    job.finished_at = datetime.utcnow()
+    db.commit()
+
+
+@router.post("/import", response_model=schemas.TaskImport, status_code=202)
+async def import_tasks(
+    *,
+    request: Request,
+    db: Session = Depends(dependencies.get_db),
+    format: Optional[str] = Query(None, description="csv or ndjson; taken from Content-Type if omitted"),
+    current_user: models.User = Depends(dependencies.get_current_active_user),
+) -> Any:
+    """
+    Bulk import tasks from a streamed CSV or NDJSON body. Each record has
+    the fields of a task creation request. The upload is loaded by a
+    background job; poll GET /import/{import_id} for progress. No
+    assignment notifications are sent for imported tasks.
+    """
+    format = format or format_from_content_type(request.headers.get("content-type", ""))
+    if format not in FORMATS:
+        raise HTTPException(
+            status_code=415,
+            detail="Upload text/csv or application/x-ndjson, or pass ?format=csv|ndjson",
+        )
+    # Celery workers run elsewhere and can only read a directory they share
+    if uses_broker() and not settings.IMPORT_DIR:
+        raise HTTPException(
+            status_code=503,
+            detail="Bulk import is not configured: IMPORT_DIR must be shared with the workers",
+        )
+    job = await run_in_threadpool(create_import, db, current_user.id, format)
+    try:
+        size = await spool_upload(request.stream(), job.file_path, settings.IMPORT_MAX_BYTES)
+    except ImportTooLarge as e:
+        await run_in_threadpool(_fail_import, db, job, str(e))
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception:
+        await run_in_threadpool(_fail_import, db, job, "upload interrupted")
+        raise
+    return await run_in_threadpool(_queue_import, db, job, size)
+
+
+@router.get("/import/{import_id}", response_model=schemas.TaskImport)
+def read_task_import(
+    *,
+    db: Session = Depends(dependencies.get_db),
+    import_id: int,
+    current_user: models.User = Depends(dependencies.get_current_active_user),
+) -> Any:
+    """
+    Get the progress of a bulk import.
+    """
+    job = db.query(models.TaskImport).filter(
+        models.TaskImport.id == import_id,
+        models.TaskImport.owner_id == current_user.id,
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
+
+
+@router.get(
+    "/changes",
+    response_model=schemas.TaskChanges,
+    dependencies=[Depends(dependencies.rate_limit("tasks_changes"))],
+)
+def read_task_changes(
+    *,
+    db: Session = Depends(dependencies.get_read_db),
+    since: Optional[str] = Query(None, description="next_token from the previous call; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum changes to return"),
+    current_user: models.User = Depends(dependencies.get_current_active_user),
+) -> Any:
+    """
+    Tasks created or updated, and tasks deleted, since `since`, oldest
+    change first. Call again with `next_token` while `has_more` is true.
+    Archived tasks are reported as deleted. A 410 means the token is older
+    than the tombstone retention and the client must resync from scratch.
+    """
+    # A replica is fine: it applies commits in order, so a lagging read just
+    # returns a shorter prefix of the changes
+    try:
+        return read_changes(db, current_user.id, _owned_by(models.Task, current_user.id), since, limit)
+    except InvalidSyncToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SyncTokenExpired as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+
 @router.get("/{task_id}", response_model=schemas.Task)
 def read_task(
     *,
@@ -113,15 +372,47 @@ def read_task(
     """
     Get task by ID.
     """
-    task = db.query(models.Task).join(models.Project).filter(
+    task = db.query(models.Task).filter(
         models.Task.id == task_id,
-        models.Project.owner_id == current_user.id,
+        *_owned_by(models.Task, current_user.id),
     ).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
+@router.get("/{task_id}/history", response_model=List[schemas.TaskActivity])
+def read_task_history(
+    *,
+    db: Session = Depends(dependencies.get_db),
+    task_id: int,
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    current_user: models.User = Depends(dependencies.get_current_active_user),
+) -> Any:
+    """
+    Get a task's change history, newest first. Kept after the task is deleted.
+    """
+    # Write this process's buffered changes first, so a client sees its own
+    # edits; reads the primary for the same reason
+    activity_log.flush()
+
+    query = db.query(models.TaskActivity).filter(
+        models.TaskActivity.task_id == task_id,
+        models.TaskActivity.owner_id == current_user.id,
+    )
+    entries = query.order_by(models.TaskActivity.id.desc()).offset((page - 1) * limit).limit(limit).all()
+    if not entries and query.first() is None:
+        # Tasks created before history was recorded have none yet
+        task = db.query(models.Task.id).filter(
+            models.Task.id == task_id,
+            *_owned_by(models.Task, current_user.id),
+        ).first()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+    return entries
+
+
 @router.patch("/{task_id}", response_model=schemas.Task)
 def update_task(
     *,
@@ -133,9 +424,9 @@ def update_task(
     """
     Update a task.
     """
-    task = db.query(models.Task).join(models.Project).filter(
+    task = db.query(models.Task).filter(
         models.Task.id == task_id,
-        models.Project.owner_id == current_user.id,
+        *_owned_by(models.Task, current_user.id),
     ).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -146,24 +437,52 @@ def update_task(
     
     # Update task fields
     update_data = task_in.dict(exclude_unset=True)
+    if "due_date" in update_data:
+        update_data["due_date"] = _utc(update_data["due_date"])
+    if update_data.get("project_id", task.project_id) != task.project_id:
+        # Tasks may only move between the user's own projects, which keeps owner_id valid
+        project = db.query(models.Project).filter(
+            models.Project.id == update_data["project_id"],
+            models.Project.owner_id == current_user.id,
+            models.Project.deleted_at.is_(None),
+        ).first()
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+    changes = field_changes(task, update_data)
     for field, value in update_data.items():
         setattr(task, field, value)
     
+    # Only touch reminders when something they depend on changed
+    if "due_date" in update_data or task.status != old_status:
+        schedule_task_reminders(db, task)
+
     db.add(task)
     db.commit()
     db.refresh(task)
+
+    if changes:
+        activity_log.record(task.id, task.owner_id, current_user.id, ActivityAction.UPDATED, changes)
+    invalidate_task_counts(current_user.id)
+    publish_task_event(
+        "task.updated",
+        current_user.id,
+        {
+            "task": schemas.Task.model_validate(task).model_dump(mode="json"),
+            "fields": list(update_data),
+        },
+    )
     
     # Send notifications if needed
     if task.status != old_status:
         try:
-            notify_task_status_changed.delay(task.id, str(old_status), str(task.status))
+            enqueue("notify_task_status_changed", task.id, str(old_status), str(task.status))
         except Exception as e:
             # Log the error but don't fail the task update
             print(f"Warning: Could not send status change notification: {str(e)}")
     
     if task.assigned_user_id and task.assigned_user_id != old_assigned_user_id:
         try:
-            notify_task_assigned.delay(task.id)
+            enqueue("notify_task_assigned", task.id)
         except Exception as e:
             # Log the error but don't fail the task update
             print(f"Warning: Could not send assignment notification: {str(e)}")
@@ -181,13 +500,23 @@ def delete_task(
     """
     Delete a task.
     """
-    task = db.query(models.Task).join(models.Project).filter(
+    task = db.query(models.Task).filter(
         models.Task.id == task_id,
-        models.Project.owner_id == current_user.id,
+        *_owned_by(models.Task, current_user.id),
     ).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    project_id = task.project_id
+    snapshot = task_snapshot(task, ActivityAction.DELETED)
     db.delete(task)
     db.commit()
+
+    activity_log.record(task_id, current_user.id, current_user.id, ActivityAction.DELETED, snapshot)
+    invalidate_task_counts(current_user.id)
+    publish_task_event(
+        "task.deleted",
+        current_user.id,
+        {"task_id": task_id, "project_id": project_id},
+    )
     return task
\ No newline at end of file
@@ -13,7 +13,7 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
-    db: Session = Depends(dependencies.get_db),
+    db: Session = Depends(dependencies.get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user: models.User = Depends(dependencies.get_current_active_superuser),
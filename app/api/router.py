@@ -1,10 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.endpoints import auth, projects, tasks, users
+from app.api.dependencies import rate_limit
+from app.api.endpoints import auth, debug, events, projects, tasks, users
 
 api_router = APIRouter()
 
+# Auth routes set their own per-IP limits; everything else shares the default
+default_rate_limit = [Depends(rate_limit("default"))]
+
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
-api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
\ No newline at end of file
+api_router.include_router(users.router, prefix="/users", tags=["users"], dependencies=default_rate_limit)
+api_router.include_router(projects.router, prefix="/projects", tags=["projects"], dependencies=default_rate_limit)
+api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"], dependencies=default_rate_limit)
+api_router.include_router(events.router, prefix="/events", tags=["events"], dependencies=default_rate_limit)
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"], dependencies=default_rate_limit)
\ No newline at end of file
@@ -0,0 +1,214 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anyio
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=5)
+
+
+def _zstd(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(body)
+
+
+def available_encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """
+    Encoders usable in this process, in order of preference.
+    """
+    encoders: Dict[str, Callable[[bytes], bytes]] = {}
+    if brotli is not None:
+        encoders["br"] = _brotli
+    if zstandard is not None:
+        encoders["zstd"] = _zstd
+    encoders["gzip"] = _gzip
+    return encoders
+
+
+def choose_encoding(accept_encoding: str, encoders: Dict[str, Callable]) -> Optional[str]:
+    """
+    Pick the preferred encoder the client accepts (ignoring q=0 entries).
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    for name in encoders:
+        if name in accepted or "*" in accepted:
+            return name
+    return None
+
+
+class CompressedCache:
+    """
+    Size-bounded LRU of compressed bodies keyed by encoding and a digest of
+    the uncompressed body, so identical responses are compressed once.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[str, bytes], value: bytes) -> None:
+        if len(value) > self.max_bytes // 8:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]], field: bytes) -> bytes:
+    """
+    The response's Vary fields (e.g. Origin, set by CORSMiddleware) with
+    `field` added, as one header value.
+    """
+    fields = [
+        part.strip()
+        for name, value in headers
+        if name.lower() == b"vary"
+        for part in value.split(b",")
+        if part.strip()
+    ]
+    if b"*" not in fields and field.lower() not in (part.lower() for part in fields):
+        fields.append(field)
+    return b", ".join(fields)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete (non-streaming) responses whose
+    content type is allowlisted and whose body is at least `minimum_size`
+    bytes. Bodies of `thread_minimum_size` bytes or more are compressed in
+    a worker thread so the event loop keeps serving other requests.
+    Streaming responses (e.g. Server-Sent Events) pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        thread_minimum_size: int = 64 * 1024,
+        content_types: Tuple[str, ...] = ("application/json", "text/"),
+        cache_bytes: int = 32 * 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+        self.content_types = content_types
+        self.encoders = available_encoders()
+        self.cache = CompressedCache(cache_bytes) if cache_bytes > 0 else None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"), self.encoders)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[dict] = None
+        passthrough = False
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if not self._should_compress(message["headers"]):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if message.get("more_body", False) or len(body) < self.minimum_size:
+                    # Streaming or small: send as is
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressed = await self._compress(encoding, body)
+                response_headers = [
+                    (name, value)
+                    for name, value in start_message["headers"]
+                    if name.lower() not in (b"content-length", b"vary")
+                ]
+                response_headers += [
+                    (b"content-encoding", encoding.encode()),
+                    (b"content-length", str(len(compressed)).encode()),
+                    (b"vary", _add_vary(start_message["headers"], b"Accept-Encoding")),
+                ]
+                await send({**start_message, "headers": response_headers})
+                await send({"type": "http.response.body", "body": compressed})
+                return
+            # e.g. http.response.pathsend: the server sends the file as is
+            passthrough = True
+            if start_message is not None:
+                await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        content_type = b""
+        for name, value in headers:
+            name = name.lower()
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        content_type = content_type.decode("latin-1").lower()
+        return any(content_type.startswith(allowed) for allowed in self.content_types)
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        key = None
+        if self.cache is not None:
+            key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        encoder = self.encoders[encoding]
+        if len(body) >= self.thread_minimum_size:
+            compressed = await anyio.to_thread.run_sync(encoder, body)
+        else:
+            compressed = encoder(body)
+        if key is not None:
+            self.cache.put(key, compressed)
+        return compressed
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Pattern, Tuple
+
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Request classes, in the order queued requests are admitted
+HIGH, NORMAL, LOW = 0, 1, 2
+PRIORITY_NAMES = {HIGH: "high", NORMAL: "normal", LOW: "low"}
+
+# Smoothing of the latency averages: the short one follows the last few
+# dozen requests, the long one (the baseline) the last few hundred
+SHORT_ALPHA = 0.1
+LONG_ALPHA = 0.01
+# Multiplicative decrease on congestion
+BACKOFF = 0.9
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on the number of requests in flight. Each completed
+    request's service time (time after admission) feeds a short and a long
+    moving average. When the short one exceeds `tolerance` times the long
+    one, or a request fails with a 5xx, the limit shrinks by BACKOFF, at
+    most once per current latency so one slow burst counts once. Otherwise
+    a request that found the limit reached grows it by 1/limit, about +1
+    per limit's worth of requests.
+
+    Requests beyond the limit wait in per-priority FIFO queues for up to
+    `queue_timeout` seconds and are admitted highest priority first. When
+    `max_queue` requests are waiting, an arrival displaces the newest
+    waiter of a lower priority, or is rejected itself. Runs on the event
+    loop only, so it needs no locks.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        tolerance: float,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tolerance = tolerance
+        self.in_flight = 0
+        self._queues: Dict[int, Deque[asyncio.Future]] = {priority: deque() for priority in PRIORITY_NAMES}
+        self._short_latency: Optional[float] = None
+        self._long_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self.admitted = 0
+        self.shed = 0
+
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(self, priority: int) -> bool:
+        """
+        Wait for a slot. Returns False if the request should be shed.
+        """
+        if self.in_flight < int(self.limit) and not self.queued():
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if self.queued() >= self.max_queue and not self._displace(priority):
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[priority].append(waiter)
+        try:
+            admitted = await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            admitted = False
+        except asyncio.CancelledError:
+            # Client went away; hand a slot we were given to the next waiter
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            self._discard(priority, waiter)
+            raise
+        self._discard(priority, waiter)
+        if waiter.done() and waiter.result() and not admitted:
+            # Admitted just as the wait timed out
+            admitted = True
+        if not admitted:
+            self.shed += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def _discard(self, priority: int, waiter: asyncio.Future) -> None:
+        try:
+            self._queues[priority].remove(waiter)
+        except ValueError:
+            pass
+        if not waiter.done():
+            waiter.set_result(False)
+
+    def _displace(self, priority: int) -> bool:
+        for lower in sorted(self._queues, reverse=True):
+            if lower <= priority:
+                return False
+            if self._queues[lower]:
+                waiter = self._queues[lower].pop()
+                if not waiter.done():
+                    waiter.set_result(False)
+                return True
+        return False
+
+    def release(self) -> None:
+        """
+        Free a slot, handing it straight to the next waiter if there is one.
+        """
+        if self.in_flight <= int(self.limit):
+            for priority in sorted(self._queues):
+                queue = self._queues[priority]
+                while queue:
+                    waiter = queue.popleft()
+                    if not waiter.done():
+                        # The slot passes on without in_flight changing
+                        waiter.set_result(True)
+                        return
+        self.in_flight -= 1
+
+    def observe(self, latency: float, failed: bool, was_saturated: bool) -> None:
+        """
+        Adjust the limit for one completed request.
+        """
+        if self._short_latency is None:
+            self._short_latency = self._long_latency = latency
+        else:
+            self._short_latency += SHORT_ALPHA * (latency - self._short_latency)
+            self._long_latency += LONG_ALPHA * (latency - self._long_latency)
+
+        now = time.monotonic()
+        congested = failed or self._short_latency > self.tolerance * self._long_latency
+        if congested:
+            if now - self._last_decrease >= self._short_latency:
+                self.limit = max(self.min_limit, self.limit * BACKOFF)
+                self._last_decrease = now
+        elif was_saturated:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": {PRIORITY_NAMES[priority]: len(queue) for priority, queue in self._queues.items()},
+            "latency_ms": round((self._short_latency or 0) * 1000, 1),
+            "baseline_latency_ms": round((self._long_latency or 0) * 1000, 1),
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    ASGI middleware putting /api requests through an AdaptiveLimiter so a
+    slow database makes excess requests wait briefly and then fail fast
+    with 503, instead of piling up in the threadpool behind the connection
+    pool. Paths outside /api (health checks, docs, static files) and
+    `exempt_paths` (long-lived streams, uploads) bypass it. GET requests to
+    `low_priority_paths` (list endpoints and other heavy reads) queue behind
+    other requests; a `{param}` segment in a path matches any one segment.
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: AdaptiveLimiter,
+        exempt_paths: Tuple[str, ...] = (),
+        low_priority_paths: Tuple[str, ...] = (),
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.exempt_paths = exempt_paths
+        self.low_priority_paths = {path.rstrip("/") for path in low_priority_paths if "{" not in path}
+        self.low_priority_patterns: List[Pattern] = [
+            re.compile(re.sub(r"\\\{[^/]*?\\\}", "[^/]+", re.escape(path.rstrip("/"))) + "$")
+            for path in low_priority_paths
+            if "{" in path
+        ]
+
+    def _priority(self, scope) -> Optional[int]:
+        path = scope["path"]
+        if not path.startswith("/api/") or path.startswith(self.exempt_paths):
+            return None
+        if scope["method"] in ("GET", "HEAD"):
+            path = path.rstrip("/")
+            if path in self.low_priority_paths or any(pattern.match(path) for pattern in self.low_priority_patterns):
+                return LOW
+            return HIGH
+        return NORMAL
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        priority = self._priority(scope)
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        was_saturated = self.limiter.in_flight >= int(self.limiter.limit)
+        if not await self.limiter.acquire(priority):
+            response = JSONResponse(
+                {"detail": "Server is overloaded, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.limiter.release()
+            self.limiter.observe(time.perf_counter() - started, status_code >= 500, was_saturated)
+
+
+def metrics_text(stats: Dict[str, object]) -> str:
+    """
+    Limiter stats in the Prometheus text format.
+    """
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[Tuple[str, object]]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+    metric("api_concurrency_limit", "gauge", "Current adaptive concurrency limit.", [("", stats["limit"])])
+    metric("api_requests_in_flight", "gauge", "Admitted requests in progress.", [("", stats["in_flight"])])
+    metric(
+        "api_requests_queued", "gauge", "Requests waiting for a slot, by priority.",
+        [(f'{{priority="{name}"}}', depth) for name, depth in stats["queued"].items()],
+    )
+    metric(
+        "api_request_latency_seconds", "gauge", "Recent mean service time of admitted requests.",
+        [("", stats["latency_ms"] / 1000)],
+    )
+    metric("api_requests_admitted_total", "counter", "Requests admitted.", [("", stats["admitted"])])
+    metric("api_requests_shed_total", "counter", "Requests rejected with 503.", [("", stats["shed"])])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,173 @@
+"""
+Serve the built frontend (Vite's `dist/`) from the API process.
+
+    python -m app.core.frontend frontend/dist
+
+writes `.gz` (and `.br`, when brotli is installed) files next to each
+compressible asset; FrontendFiles serves them instead of the original to
+clients that accept the encoding.
+"""
+import gzip
+import mimetypes
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import FileResponse, JSONResponse, Response
+
+from app.core.compression import choose_encoding
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Vite writes content-hashed file names under assets/, so they never change
+IMMUTABLE_PREFIX = "assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# index.html and public/ files keep their names across builds
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# File suffix of each precompressed variant, in order of preference
+PRECOMPRESSED = {"br": ".br", "gzip": ".gz"}
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+PRECOMPRESS_MIN_SIZE = 1024
+
+
+@dataclass
+class StaticFile:
+    path: str
+    stat: os.stat_result
+    media_type: str
+    cache_control: str
+    # Encoding -> (path, stat) of the precompressed copy
+    variants: Dict[str, Tuple[str, os.stat_result]] = field(default_factory=dict)
+
+
+def _media_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+class FrontendFiles:
+    """
+    ASGI app for a built single-page app, meant to be the router's
+    fallback (`app.router.default`) for requests no route matched. The directory is indexed (and stat'ed) once at startup,
+    so requests never touch paths outside it or the filesystem metadata.
+    Paths that look like client-side routes (no file extension) fall back
+    to index.html; missing assets and /api/* paths are 404s.
+    Files are sent with FileResponse, which hands the path to the server
+    (`http.response.pathsend`, sendfile) when the server supports it.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.realpath(directory)
+        self.files = self._index(self.directory)
+        self.index = self.files.get("index.html")
+        if self.index is None:
+            raise RuntimeError(f"Frontend directory '{directory}' has no index.html; build the frontend first")
+
+    @staticmethod
+    def _index(directory: str) -> Dict[str, StaticFile]:
+        files: Dict[str, StaticFile] = {}
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, directory).replace(os.sep, "/")
+                if any(relative.endswith(suffix) for suffix in PRECOMPRESSED.values()):
+                    continue
+                cache_control = (
+                    IMMUTABLE_CACHE_CONTROL if relative.startswith(IMMUTABLE_PREFIX) else REVALIDATE_CACHE_CONTROL
+                )
+                files[relative] = StaticFile(
+                    path=path,
+                    stat=os.stat(path),
+                    media_type=_media_type(relative),
+                    cache_control=cache_control,
+                    variants={
+                        encoding: (path + suffix, os.stat(path + suffix))
+                        for encoding, suffix in PRECOMPRESSED.items()
+                        if os.path.isfile(path + suffix)
+                    },
+                )
+        return files
+
+    def _lookup(self, path: str) -> Optional[StaticFile]:
+        relative = path.lstrip("/")
+        if relative == "":
+            return self.index
+        static_file = self.files.get(relative)
+        if static_file is not None:
+            return static_file
+        last_segment = relative.rsplit("/", 1)[-1]
+        if relative.startswith(("api/", IMMUTABLE_PREFIX)) or "." in last_segment:
+            return None
+        return self.index
+
+    async def __call__(self, scope, receive, send) -> None:
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response = JSONResponse({"detail": "Method Not Allowed"}, status_code=405, headers={"Allow": "GET, HEAD"})
+            await response(scope, receive, send)
+            return
+
+        static_file = self._lookup(scope["path"])
+        if static_file is None:
+            # Same body as FastAPI's own 404s, e.g. for unknown /api paths
+            await JSONResponse({"detail": "Not Found"}, status_code=404)(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        path, stat = static_file.path, static_file.stat
+        headers = {"Cache-Control": static_file.cache_control}
+        if static_file.variants:
+            headers["Vary"] = "Accept-Encoding"
+            accept_encoding = request_headers.get(b"accept-encoding", b"").decode("latin-1")
+            encoding = choose_encoding(accept_encoding, static_file.variants)
+            if encoding is not None:
+                path, stat = static_file.variants[encoding]
+                headers["Content-Encoding"] = encoding
+
+        response = FileResponse(path, media_type=static_file.media_type, headers=headers, stat_result=stat)
+        etag = response.headers["etag"]
+        if_none_match = request_headers.get(b"if-none-match", b"").decode("latin-1")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            headers.pop("Content-Encoding", None)
+            response = Response(status_code=304, headers={**headers, "ETag": etag})
+        await response(scope, receive, send)
+
+
+def precompress(directory: str) -> int:
+    """
+    Write .gz/.br copies of compressible files of at least
+    PRECOMPRESS_MIN_SIZE bytes, keeping only those that are smaller.
+    Returns the number of files written.
+    """
+    encoders = {".gz": lambda body: gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders[".br"] = lambda body: brotli.compress(body, quality=11)
+
+    written = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if any(name.endswith(suffix) for suffix in PRECOMPRESSED.values()):
+                continue
+            path = os.path.join(root, name)
+            if not _media_type(path).startswith(COMPRESSIBLE_TYPES) or os.path.getsize(path) < PRECOMPRESS_MIN_SIZE:
+                continue
+            with open(path, "rb") as f:
+                body = f.read()
+            for suffix, encode in encoders.items():
+                compressed = encode(body)
+                if len(compressed) < len(body):
+                    with open(path + suffix, "wb") as f:
+                        f.write(compressed)
+                    written += 1
+    return written
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python -m app.core.frontend <dist directory>")
+    print(f"Wrote {precompress(sys.argv[1])} precompressed files")
@@ -0,0 +1,199 @@
+"""
+On-demand profiling of a live process: a statistical sampler over all
+threads' Python stacks (sys._current_frames), and optionally a tracemalloc
+allocation diff over the same window. Nothing is installed until a profile
+is requested, so there is no cost in between.
+"""
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Leaf frames of threads waiting for work (thread pools, the event loop
+# polling, uvloop running in C), as (file name, function)
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("selectors.py", "select"),
+    ("base_events.py", "run_forever"),
+    ("base_events.py", "run_until_complete"),
+    ("runners.py", "run"),
+}
+
+# Allocation sites reported in a memory diff
+MEMORY_TOP = 25
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+@dataclass
+class Profile:
+    pid: int
+    seconds: float
+    interval: float
+    samples: int = 0
+    # Thread stacks skipped as idle
+    idle: int = 0
+    # Time spent taking samples, as a fraction of `seconds`
+    overhead: float = 0.0
+    stacks: Counter = field(default_factory=Counter)
+    memory: Optional[List[Dict[str, Any]]] = None
+
+    def collapsed(self) -> str:
+        """
+        One "thread;outer;...;inner count" line per distinct stack, the
+        input format of flamegraph.pl, speedscope and inferno.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "pid": self.pid,
+            "seconds": self.seconds,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "idle_stacks_skipped": self.idle,
+            "overhead": round(self.overhead, 4),
+            "collapsed": self.collapsed(),
+            "memory": self.memory,
+        }
+
+
+def _short_path(path: str) -> str:
+    # Drop the interpreter/site-packages/repo prefix, keeping e.g.
+    # "sqlalchemy/orm/query.py" or "app/services/tasks.py"
+    for marker in ("site-packages" + os.sep, "dist-packages" + os.sep):
+        if marker in path:
+            return path.rsplit(marker, 1)[1]
+    cwd = os.getcwd() + os.sep
+    if path.startswith(cwd):
+        return path[len(cwd):]
+    return os.path.basename(path)
+
+
+def _thread_label(name: str) -> str:
+    # Pool threads differ only by a numeric suffix; merge them
+    return re.sub(r"[-_\d]+$", "", name) or name
+
+
+class SamplingProfiler:
+    """
+    Every `interval` seconds, records the Python stack of every thread
+    except its own. Samples are aggregated into collapsed stacks as they
+    are taken, so memory stays bounded by the number of distinct stacks.
+    Threads blocked waiting for work are skipped unless `include_idle`.
+    Stacks are per function (not line), so one function's samples merge.
+    """
+
+    def __init__(self, interval: float, include_idle: bool = False) -> None:
+        self.interval = interval
+        self.include_idle = include_idle
+        self._labels: Dict[Any, str] = {}
+        self._thread_names: Dict[int, str] = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _sample(self, profile: Profile, own_ident: int) -> None:
+        frames = sys._current_frames()
+        if not frames.keys() <= self._thread_names.keys():
+            self._thread_names = {thread.ident: _thread_label(thread.name) for thread in threading.enumerate()}
+        for ident, frame in frames.items():
+            if ident == own_ident:
+                continue
+            code = frame.f_code
+            if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                profile.idle += 1
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(self._thread_names.get(ident, str(ident)))
+            profile.stacks[";".join(reversed(stack))] += 1
+        profile.samples += 1
+
+    def run(self, seconds: float, memory: bool = False, memory_frames: int = 5) -> Profile:
+        """
+        Sample for `seconds` in the calling thread (blocking). With
+        `memory`, also diff tracemalloc snapshots taken at the start and
+        end; tracing allocations slows the whole process while it runs.
+        Raises ProfilerBusy if a profile is already running.
+        """
+        if not _profile_lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running in this process")
+        started_tracemalloc = False
+        try:
+            profile = Profile(pid=os.getpid(), seconds=seconds, interval=self.interval)
+            before = None
+            if memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(memory_frames)
+                    started_tracemalloc = True
+                before = tracemalloc.take_snapshot()
+
+            own_ident = threading.get_ident()
+            sampling_time = 0.0
+            started = time.perf_counter()
+            deadline = started + seconds
+            next_sample = started
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                self._sample(profile, own_ident)
+                sampling_time += time.perf_counter() - now
+                next_sample += self.interval
+                time.sleep(max(0.0, min(next_sample, deadline) - time.perf_counter()))
+            profile.overhead = sampling_time / max(time.perf_counter() - started, 1e-9)
+
+            if memory:
+                after = tracemalloc.take_snapshot()
+                if started_tracemalloc:
+                    tracemalloc.stop()
+                    started_tracemalloc = False
+                profile.memory = memory_diff(before, after)
+            return profile
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+            _profile_lock.release()
+
+
+def memory_diff(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+    """
+    The MEMORY_TOP allocation sites whose live memory grew the most between
+    two snapshots, with their (innermost first) tracebacks.
+    """
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "traceback")
+    return [
+        {
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "size_kb": round(stat.size / 1024, 1),
+            "count_diff": stat.count_diff,
+            "traceback": [f"{_short_path(frame.filename)}:{frame.lineno}" for frame in reversed(stat.traceback)],
+        }
+        for stat in [stat for stat in stats if stat.size_diff > 0][:MEMORY_TOP]
+    ]
@@ -0,0 +1,113 @@
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import redis_url, settings
+
+logger = logging.getLogger(__name__)
+
+# Atomic token bucket. Uses the Redis server clock so every API worker
+# agrees on time. Returns {allowed, seconds until a token is available}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(retry_after)}
+"""
+
+# How long to stay on the in-process buckets after Redis fails
+REDIS_RETRY_SECONDS = 30
+
+
+def parse_limit(limit: str) -> Tuple[int, float]:
+    """
+    Parse "<requests>/<seconds>" into (capacity, tokens per second).
+    """
+    requests, seconds = limit.split("/")
+    capacity = int(requests)
+    return capacity, capacity / float(seconds)
+
+
+class LocalTokenBuckets:
+    """
+    In-process token buckets, used when Redis isn't available. Limits are
+    then per API process rather than global.
+    """
+
+    def __init__(self, max_keys: int = 100000) -> None:
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def hit(self, key: str, capacity: int, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - ts) * rate)
+        if tokens >= 1:
+            allowed, retry_after = True, 0.0
+            tokens -= 1
+        else:
+            allowed, retry_after = False, (1 - tokens) / rate
+        if len(self._buckets) >= self.max_keys and key not in self._buckets:
+            # Drop the oldest entries; a forgotten bucket simply starts full
+            for old_key in list(self._buckets)[: self.max_keys // 10]:
+                del self._buckets[old_key]
+        self._buckets[key] = (tokens, now)
+        return allowed, retry_after
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter backed by Redis, falling back to in-process
+    buckets when Redis is not configured or unreachable.
+    """
+
+    def __init__(self, redis_url: Optional[str]) -> None:
+        self.redis_url = redis_url
+        self.local = LocalTokenBuckets()
+        self._redis = None
+        self._script = None
+        self._redis_down_until = 0.0
+
+    def _get_script(self):
+        if self._script is None:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(
+                self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+            self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    async def hit(self, key: str, limit: str) -> Tuple[bool, float]:
+        """
+        Take one token from `key`'s bucket. Returns (allowed, retry_after).
+        """
+        capacity, rate = parse_limit(limit)
+        if self.redis_url and time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, retry_after = await self._get_script()(
+                    keys=[f"ratelimit:{key}"], args=[capacity, rate]
+                )
+                return bool(allowed), float(retry_after)
+            except Exception as e:
+                logger.warning(f"Rate limiter falling back to in-process buckets: {str(e)}")
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        return self.local.hit(key, capacity, rate)
+
+
+rate_limiter = RateLimiter(redis_url(settings.RATE_LIMIT_REDIS_URL))
@@ -1,10 +1,10 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Optional, Union
 import os
 import logging
 
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
 
@@ -16,7 +16,16 @@ os.environ["PASSLIB_BUILTIN_BCRYPT"] = "1"
 # Suppress the warning message from passlib about bcrypt version
 logging.getLogger('passlib.handlers.bcrypt').setLevel(logging.ERROR)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    Build the password hashing context on first use; passlib and bcrypt are
+    only needed by the login/register/password-change paths.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_access_token(
@@ -42,11 +51,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password.
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return get_pwd_context().hash(password)
\ No newline at end of file
@@ -0,0 +1,452 @@
+"""
+Lightweight request tracing with OpenTelemetry's data model: spans with
+trace/span ids, parent links, kinds, attributes and status, propagated
+between processes in W3C `traceparent` headers. Spans are written as JSON
+lines to a local file, or logged, so no collector is needed.
+
+configure_tracing() installs the instrumentation: SQLAlchemy statements
+(every engine), Celery publish/run (instrument_celery), and the pieces
+wired in explicitly: TracingMiddleware for HTTP, the in-process job queue
+and email delivery. Sampling is decided once per trace, at its root.
+"""
+import contextvars
+import json
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INTERNAL, SERVER, CLIENT, PRODUCER, CONSUMER = "INTERNAL", "SERVER", "CLIENT", "PRODUCER", "CONSUMER"
+
+# Longest SQL statement kept in a span
+MAX_STATEMENT_LENGTH = 1000
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    context: SpanContext
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "UNSET"
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.context.sampled:
+            self.attributes[key] = value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status = "ERROR"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def to_dict(self, service_name: str) -> Dict[str, Any]:
+        return {
+            "service": service_name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """
+    The remote parent from a W3C `traceparent` header, or None if the
+    header is missing or malformed.
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3][:2], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(trace_id=parts[1], span_id=parts[2], sampled=bool(flags & 1))
+
+
+class ConsoleExporter:
+    def export(self, record: Dict[str, Any]) -> None:
+        logger.info(
+            f"span {record['service']} {record['name']} {record['duration_ms']}ms {record['status']} "
+            f"trace={record['trace_id']} span={record['span_id']} parent={record['parent_span_id']} "
+            f"{json.dumps(record['attributes'], default=str)}"
+        )
+
+    def close(self) -> None:
+        pass
+
+
+class FileExporter:
+    """
+    Appends one JSON object per span to `path`. Each span is a single
+    O_APPEND write, so forked workers can share the file without
+    interleaving lines.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def export(self, record: Dict[str, Any]) -> None:
+        os.write(self._fd, (json.dumps(record, default=str) + "\n").encode())
+
+    def close(self) -> None:
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+class Tracer:
+    """
+    Creates spans and hands sampled ones to the exporter when they end.
+    Unsampled spans are still created where a trace starts or crosses a
+    process boundary, so their "not sampled" decision propagates too;
+    child spans of an unsampled trace are skipped entirely.
+    """
+
+    def __init__(self) -> None:
+        self.service_name = "api"
+        self.sample_rate = 0.0
+        self.exporter = None
+        self.exported = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = INTERNAL,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        root: bool = True,
+    ) -> Optional[Span]:
+        """
+        A new span under `parent` (default: the current span). Without a
+        parent, starts a trace if `root` is set and returns None otherwise;
+        also None for children of unsampled traces.
+        """
+        if not self.enabled:
+            return None
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        if parent is not None:
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+            if not sampled and not root:
+                return None
+        elif root:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+            sampled = random.random() < self.sample_rate
+        else:
+            return None
+        return Span(
+            name=name,
+            kind=kind,
+            context=SpanContext(trace_id, f"{random.getrandbits(64):016x}", sampled),
+            parent_id=parent_id,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes or {}) if sampled else {},
+        )
+
+    def end_span(self, span: Optional[Span]) -> None:
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if not span.context.sampled or self.exporter is None:
+            return
+        if span.status == "UNSET":
+            span.status = "OK"
+        try:
+            self.exporter.export(span.to_dict(self.service_name))
+            self.exported += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Could not export span {span.name}: {str(e)}")
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: str = INTERNAL,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        root: bool = True,
+    ) -> Iterator[Optional[Span]]:
+        """
+        Run the block in a span that is current for its duration; records
+        an exception escaping the block.
+        """
+        span = self.start_span(name, kind, parent, attributes, root)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "service": self.service_name,
+            "sample_rate": self.sample_rate,
+            "exported": self.exported,
+            "failed": self.failed,
+        }
+
+
+tracer = Tracer()
+
+
+def configure_tracing(service_name: str) -> None:
+    """
+    Start exporting spans as `service_name` and trace SQLAlchemy
+    statements. Only the first call in a process takes effect.
+    """
+    if tracer.enabled:
+        return
+    tracer.service_name = service_name
+    tracer.sample_rate = settings.TRACING_SAMPLE_RATE
+    if settings.TRACING_EXPORTER == "console":
+        tracer.exporter = ConsoleExporter()
+    else:
+        tracer.exporter = FileExporter(settings.TRACING_FILE)
+    _instrument_sqlalchemy()
+    logger.info(f"Tracing {service_name} at sample rate {tracer.sample_rate} to {settings.TRACING_EXPORTER}")
+
+
+def shutdown_tracing() -> None:
+    if tracer.exporter is not None:
+        tracer.exporter.close()
+        tracer.exporter = None
+
+
+def traced_job(name: str, func: Callable) -> Callable:
+    """
+    Wrap a job for the in-process queue so it runs in a CONSUMER span
+    under the span that queued it.
+    """
+    current = _current_span.get()
+    if not tracer.enabled or current is None:
+        return func
+    parent = current.context
+
+    def run(*args: Any) -> Any:
+        with tracer.span(f"run {name}", CONSUMER, parent=parent, attributes={"job.queue": "in-process"}):
+            return func(*args)
+
+    return run
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware putting each HTTP request in a SERVER span, continuing
+    the caller's trace when the request has a `traceparent` header. The
+    span is named after the matched route template, e.g.
+    "GET /api/tasks/{task_id}", so requests for different ids group.
+    """
+
+    def __init__(self, app, exclude_paths: tuple = ()) -> None:
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not tracer.enabled or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope["method"]
+        span = tracer.start_span(
+            f"{method} {scope['path']}",
+            SERVER,
+            parent=parent,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.status = "ERROR"
+            await send(message)
+
+        token = _current_span.set(span)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                span.name = f"{method} {route.path}"
+                span.set_attribute("http.route", route.path)
+            _current_span.reset(token)
+            tracer.end_span(span)
+
+
+def _instrument_sqlalchemy() -> None:
+    """
+    A CLIENT span per statement on every engine, including ones created
+    later (replicas, per-worker pools). Statements outside a sampled trace
+    aren't traced.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span(
+            statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL",
+            CLIENT,
+            root=False,
+        )
+        if span is not None:
+            span.set_attribute("db.system", conn.dialect.name)
+            span.set_attribute("db.statement", statement[:MAX_STATEMENT_LENGTH])
+            if executemany:
+                span.set_attribute("db.executemany", True)
+        if context is not None:
+            context._trace_span = span
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            context._trace_span = None
+            tracer.end_span(span)
+
+    def handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.record_error(exception_context.original_exception)
+            context._trace_span = None
+            tracer.end_span(span)
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(Engine, "handle_error", handle_error)
+
+
+# Celery: publish spans are kept from before_task_publish to
+# after_task_publish, run spans from task_prerun to task_postrun, keyed by
+# task id
+_publishing: Dict[str, Span] = {}
+_running: Dict[str, Any] = {}
+
+
+def instrument_celery() -> None:
+    """
+    PRODUCER spans around publishing a task, with their context sent in
+    the message's `traceparent` header, and CONSUMER spans around running
+    it in the worker, as children of the publish span. The gap between
+    the two is the time the message spent in the broker.
+    """
+    from celery import signals
+
+    def before_publish(sender=None, headers=None, **kwargs):
+        if headers is None:
+            return
+        span = tracer.start_span(
+            f"publish {sender}",
+            PRODUCER,
+            attributes={"messaging.system": "celery", "messaging.destination.name": kwargs.get("routing_key")},
+        )
+        if span is None:
+            return
+        headers["traceparent"] = format_traceparent(span.context)
+        _publishing[headers.get("id")] = span
+
+    def after_publish(sender=None, headers=None, **kwargs):
+        if headers is not None:
+            tracer.end_span(_publishing.pop(headers.get("id"), None))
+
+    def prerun(task_id=None, task=None, **kwargs):
+        parent = parse_traceparent(getattr(task.request, "traceparent", None))
+        span = tracer.start_span(
+            f"run {task.name}",
+            CONSUMER,
+            parent=parent,
+            attributes={"messaging.system": "celery", "messaging.message.id": task_id},
+        )
+        if span is None:
+            return
+        if task.request.retries:
+            span.set_attribute("celery.retries", task.request.retries)
+        _running[task_id] = (span, _current_span.set(span))
+
+    def postrun(task_id=None, state=None, **kwargs):
+        entry = _running.pop(task_id, None)
+        if entry is None:
+            return
+        span, token = entry
+        span.set_attribute("celery.state", state)
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # Reset from a different context; clear it instead
+            _current_span.set(None)
+        tracer.end_span(span)
+
+    def failure(task_id=None, exception=None, **kwargs):
+        entry = _running.get(task_id)
+        if entry is not None and exception is not None:
+            entry[0].record_error(exception)
+
+    signals.before_task_publish.connect(before_publish, weak=False)
+    signals.after_task_publish.connect(after_publish, weak=False)
+    signals.task_prerun.connect(prerun, weak=False)
+    signals.task_postrun.connect(postrun, weak=False)
+    signals.task_failure.connect(failure, weak=False)
@@ -2,4 +2,8 @@
 from app.db.base_class import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.project import Project  # noqa
-from app.models.task import Task  # noqa
\ No newline at end of file
+from app.models.task import ArchivedTask, Task  # noqa
+from app.models.reminder import TaskReminder  # noqa
+from app.models.task_import import TaskImport  # noqa
+from app.models.task_activity import TaskActivity  # noqa
+from app.models.task_sync import TaskChangeCounter, TaskTombstone  # noqa
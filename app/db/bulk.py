@@ -0,0 +1,105 @@
+"""
+Bulk row loading: `COPY ... FROM STDIN` on PostgreSQL, batched
+`executemany` on SQLite and anything else. Used by the task importer and
+the benchmark seeder.
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+def batched(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    batch: List[Tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Loader:
+    """
+    Writes batches of row tuples into a table through a raw DBAPI connection.
+    """
+
+    def __init__(self, engine: Engine, durable: bool = True) -> None:
+        self.dialect = engine.dialect.name
+        self.paramstyle = engine.dialect.paramstyle
+        self.connection = engine.raw_connection()
+        self.durable = durable
+        if self.dialect == "sqlite" and not durable:
+            self.connection.execute("PRAGMA synchronous = OFF")
+
+    def load(self, table: str, columns: Sequence[str], rows: Iterable[Tuple], batch_size: int) -> int:
+        count = 0
+        cursor = self.connection.cursor()
+        try:
+            for batch in batched(rows, batch_size):
+                if self.dialect == "postgresql":
+                    self._copy(cursor, table, columns, batch)
+                elif self.dialect == "sqlite":
+                    cursor.executemany(self._insert_sql(table, columns), [self._sqlite_row(row) for row in batch])
+                else:
+                    cursor.executemany(self._insert_sql(table, columns), batch)
+                self.connection.commit()
+                count += len(batch)
+        finally:
+            cursor.close()
+        return count
+
+    def _copy(self, cursor: Any, table: str, columns: Sequence[str], batch: List[Tuple]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            # Unquoted empty fields are NULL in COPY's CSV format
+            writer.writerow(
+                "" if value is None
+                else ("t" if value else "f") if isinstance(value, bool)
+                else value.isoformat() if isinstance(value, datetime)
+                else value
+                for value in row
+            )
+        buffer.seek(0)
+        cursor.copy_expert(
+            f'COPY "{table}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buffer
+        )
+
+    @staticmethod
+    def _sqlite_row(row: Tuple) -> Tuple:
+        # Match the fixed-width format SQLAlchemy's DateTime uses on SQLite
+        return tuple(
+            value.isoformat(" ", "microseconds") if isinstance(value, datetime) else value
+            for value in row
+        )
+
+    def _insert_sql(self, table: str, columns: Sequence[str]) -> str:
+        marker = "?" if self.paramstyle == "qmark" else "%s"
+        return f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({", ".join([marker] * len(columns))})'
+
+    def reset_sequences(self, tables: Sequence[str]) -> None:
+        """
+        Move PostgreSQL id sequences past the explicitly inserted ids.
+        """
+        if self.dialect != "postgresql":
+            return
+        cursor = self.connection.cursor()
+        for table in tables:
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                f'COALESCE((SELECT MAX(id) FROM "{table}"), 1))'
+            )
+        self.connection.commit()
+        cursor.close()
+
+    def close(self) -> None:
+        if self.dialect == "sqlite" and not self.durable:
+            # The connection may go back to a pool
+            self.connection.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        self.connection.close()
@@ -0,0 +1,84 @@
+import argparse
+import logging
+import os
+
+from sqlalchemy import inspect
+
+from app.db.base import Base
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Repository root, where alembic.ini lives
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def missing_tables() -> list:
+    """
+    Return the names of model tables that don't exist in the database yet.
+    """
+    existing = set(inspect(engine).get_table_names())
+    return [name for name in Base.metadata.tables if name not in existing]
+
+
+def init_db() -> None:
+    """
+    Create any missing tables. Production schemas are managed by Alembic;
+    this is meant for local development and tests.
+    """
+    Base.metadata.create_all(bind=engine)
+
+
+def migrate() -> None:
+    """
+    Upgrade the schema to the latest Alembic revision. Databases created by
+    earlier releases, which ran create_all on import and never recorded a
+    revision, have the initial schema and are stamped at 001 first.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    existing = set(inspect(engine).get_table_names())
+    if "alembic_version" not in existing and "user" in existing:
+        logger.info("Unversioned schema found; stamping revision 001")
+        command.stamp(config, "001")
+    command.upgrade(config, "head")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create or check the database schema")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report missing tables; exit with status 1 if any are missing",
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="Run Alembic migrations up to head (what deployments run before starting the API)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.migrate:
+        migrate()
+        return
+    missing = missing_tables()
+    if args.check:
+        if missing:
+            logger.error(f"Missing tables: {', '.join(missing)}")
+            raise SystemExit(1)
+        logger.info("Database schema is up to date")
+        return
+
+    if missing:
+        init_db()
+        logger.info(f"Created tables: {', '.join(missing)}")
+    else:
+        logger.info("All tables already exist")
+
+
+if __name__ == "__main__":
+    main()
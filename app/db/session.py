@@ -1,27 +1,77 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 import os
 
-from app.core.config import settings
+from app.core.config import redis_url, settings
 
-# Create SQLAlchemy engine with proper configuration for production
-if "postgresql" in settings.DATABASE_URL:
-    # PostgreSQL configuration for production
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        pool_size=10,
-        max_overflow=20,
-    )
-else:
-    # SQLite configuration for development
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+logger = logging.getLogger(__name__)
+
+
+def create_db_engine(url: str, pool_size: int = 10, max_overflow: int = 20) -> Engine:
+    """
+    Create an engine for the primary or a replica with the settings that
+    suit its database.
+    """
+    if "postgresql" in url:
+        # PostgreSQL configuration for production
+        return create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_recycle=300,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+        )
+
+    if "sqlite" not in url:
+        return create_engine(url)
+
+    # SQLite configuration for development and edge deployments
+    in_memory = url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+    options = {}
+    if not in_memory:
+        # Keep only a few connections (each with its own page cache) open
+        # between bursts; overflow connections are closed when returned,
+        # so request bursts don't queue on the pool
+        options = {"pool_size": min(pool_size, settings.SQLITE_POOL_SIZE), "max_overflow": max_overflow}
+    sqlite_engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,
+            # Busy handler: wait this long for a lock instead of failing
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        **options,
     )
 
+    @event.listens_for(sqlite_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked to
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if not in_memory:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+            # Negative values are in KiB rather than pages
+            cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return sqlite_engine
+
+
+# Create SQLAlchemy engine with proper configuration for production
+engine = create_db_engine(settings.DATABASE_URL)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -29,6 +79,165 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class ReplicaRouter:
+    """
+    Picks a read replica round-robin, skipping replicas that failed their
+    last health check. Health checks run lazily, at most once per
+    `health_check_interval` seconds per replica.
+    """
+
+    def __init__(self, engines: List[Engine], health_check_interval: float) -> None:
+        self.engines = engines
+        self.health_check_interval = health_check_interval
+        self._healthy = [True] * len(engines)
+        self._checked_at = [0.0] * len(engines)
+        self._checking = [False] * len(engines)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def _check(self, index: int) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at[index] < self.health_check_interval:
+            return self._healthy[index]
+        with self._lock:
+            # Another thread is probing (or just probed) this replica; use
+            # the last result rather than waiting on it
+            if self._checking[index] or now - self._checked_at[index] < self.health_check_interval:
+                return self._healthy[index]
+            self._checking[index] = True
+        # The probe runs outside the lock, so a hung replica only delays
+        # the one request that checks it
+        try:
+            with self.engines[index].connect() as connection:
+                connection.execute(text("SELECT 1"))
+            healthy = True
+        except Exception:
+            healthy = False
+        with self._lock:
+            self._healthy[index] = healthy
+            self._checked_at[index] = time.monotonic()
+            self._checking[index] = False
+        return healthy
+
+    def choose(self) -> Optional[Engine]:
+        """
+        Return a healthy replica engine, or None if there is none.
+        """
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._check(index):
+                return self.engines[index]
+        return None
+
+
+replica_router = ReplicaRouter(
+    [create_db_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+    settings.REPLICA_HEALTH_CHECK_INTERVAL,
+)
+
+# How long to stay on the in-process markers after Redis fails
+REDIS_RETRY_SECONDS = 30
+
+
+class RecentWriters:
+    """
+    Marks users who committed a write in the last READ_YOUR_WRITES_SECONDS.
+    Markers live in Redis so every API worker sees them, falling back to
+    an in-process dict when Redis is not configured or unreachable.
+    """
+
+    def __init__(self, redis_url: Optional[str]) -> None:
+        self.redis_url = redis_url
+        self._redis = None
+        self._redis_down_until = 0.0
+        # user id -> time.monotonic() of that user's last committed write
+        self._local: Dict[int, float] = {}
+
+    def _client(self):
+        if self.redis_url is None or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.from_url(self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        return self._redis
+
+    def _redis_failed(self, e: Exception) -> None:
+        logger.warning(f"Read-your-writes falling back to in-process markers: {str(e)}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def mark(self, user_id: int) -> None:
+        client = self._client()
+        if client is not None:
+            try:
+                client.set(f"wrote:{user_id}", 1, px=settings.READ_YOUR_WRITES_SECONDS * 1000)
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        now = time.monotonic()
+        self._local[user_id] = now
+        if len(self._local) > 10000:
+            cutoff = now - settings.READ_YOUR_WRITES_SECONDS
+            for key, written_at in list(self._local.items()):
+                if written_at < cutoff:
+                    self._local.pop(key, None)
+
+    def wrote_recently(self, user_id: int) -> bool:
+        client = self._client()
+        if client is not None:
+            try:
+                return bool(client.exists(f"wrote:{user_id}"))
+            except Exception as e:
+                self._redis_failed(e)
+        written_at = self._local.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < settings.READ_YOUR_WRITES_SECONDS
+
+
+recent_writers = RecentWriters(redis_url(settings.READ_YOUR_WRITES_REDIS_URL))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_writer(session, *args):
+    # `user_id` is set on the request's session by get_current_user
+    user_id = session.info.get("user_id")
+    if user_id is not None and replica_router.engines:
+        recent_writers.mark(user_id)
+
+
+def get_read_session(user_id: Optional[int] = None) -> Session:
+    """
+    Open a session for read-only work. Uses a healthy replica unless none
+    is configured or available, or the user wrote recently enough that a
+    lagging replica might not show their change yet.
+    """
+    if not replica_router.engines:
+        return SessionLocal()
+    if user_id is not None and recent_writers.wrote_recently(user_id):
+        return SessionLocal()
+    replica = replica_router.choose()
+    if replica is None:
+        return SessionLocal()
+    return SessionLocal(bind=replica)
+
+
+@contextmanager
+def session_scope(read_only: bool = False) -> Iterator[Session]:
+    """
+    Session for work outside a request (Celery tasks, scripts): rolled
+    back if the block raises, always closed. `read_only` sessions may use
+    a replica (see get_read_session).
+    """
+    db = get_read_session() if read_only else SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 def get_db():
     """
     Dependency for getting DB session.
@@ -37,4 +246,46 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def prewarm_pool(size: int) -> int:
+    """
+    Open up to `size` pooled connections so the first requests don't pay
+    for connection setup. Returns the number of connections opened.
+    """
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def reset_engines_after_fork(pool_size: int, max_overflow: int) -> None:
+    """
+    Give a forked process (a Celery prefork child) its own connection
+    pools. Connections inherited from the parent are dropped without being
+    closed, since the parent still owns their sockets, and the engines are
+    re-created with pools of `pool_size` for this process.
+    """
+    global engine
+    engine.dispose(close=False)
+    for replica in replica_router.engines:
+        replica.dispose(close=False)
+    engine = create_db_engine(settings.DATABASE_URL, pool_size, max_overflow)
+    SessionLocal.configure(bind=engine)
+    replica_router.engines = [
+        create_db_engine(url, pool_size, max_overflow) for url in settings.DATABASE_REPLICA_URLS
+    ]
+
+
+def dispose_engines() -> None:
+    """
+    Close all pooled connections, e.g. when a worker process exits.
+    """
+    engine.dispose()
+    for replica in replica_router.engines:
+        replica.dispose()
@@ -1,26 +1,24 @@
 from fastapi import FastAPI, Depends
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 import logging
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
+# Settings read the .env file themselves (see Settings.model_config)
 from app.api.router import api_router
+from app.core.compression import CompressionMiddleware
+from app.core.concurrency import AdaptiveLimiter, ConcurrencyLimitMiddleware, metrics_text
 from app.core.config import settings
-from app.db.session import engine, Base, get_db
+from app.core.tracing import TracingMiddleware, configure_tracing, shutdown_tracing, tracer
+from app.db.session import get_db, prewarm_pool
+from app.services.activity import activity_log
+from app.services.background import in_process_queue, periodic_jobs, uses_broker
 from app.models import user, project, task  # Need these imports for SQLAlchemy model registration
-from app.worker import celery_app
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# DB tables setup - runs on startup
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="Task Management System API",
     description="A lightweight Task Management System API built with FastAPI, PostgreSQL, and Celery",
@@ -30,6 +28,25 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Bound concurrent /api requests so a slow database sheds load with 503s
+# instead of stalling every request (added first: runs inside CORS, so
+# 503s still carry CORS headers)
+concurrency_limiter = AdaptiveLimiter(
+    initial_limit=settings.CONCURRENCY_INITIAL_LIMIT,
+    min_limit=settings.CONCURRENCY_MIN_LIMIT,
+    max_limit=settings.CONCURRENCY_MAX_LIMIT,
+    max_queue=settings.CONCURRENCY_MAX_QUEUE,
+    queue_timeout=settings.CONCURRENCY_QUEUE_TIMEOUT_SECONDS,
+    tolerance=settings.CONCURRENCY_LATENCY_TOLERANCE,
+)
+if settings.CONCURRENCY_LIMIT_ENABLED:
+    app.add_middleware(
+        ConcurrencyLimitMiddleware,
+        limiter=concurrency_limiter,
+        exempt_paths=tuple(settings.CONCURRENCY_EXEMPT_PATHS),
+        low_priority_paths=tuple(settings.CONCURRENCY_LOW_PRIORITY_PATHS),
+    )
+
 # CORS config for production
 app.add_middleware(
     CORSMiddleware,
@@ -39,11 +56,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses for clients on slow links
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        thread_minimum_size=settings.COMPRESSION_THREAD_MIN_SIZE,
+        content_types=tuple(settings.COMPRESSION_CONTENT_TYPES),
+        cache_bytes=settings.COMPRESSION_CACHE_BYTES,
+    )
+
+# Trace requests (added last: outermost, so spans include time spent
+# queued by the concurrency limiter and compressing)
+if settings.TRACING_ENABLED:
+    configure_tracing("api")
+    app.add_middleware(TracingMiddleware, exclude_paths=tuple(settings.TRACING_EXCLUDE_PATHS))
+
 # Hook up our API routes
 app.include_router(api_router, prefix="/api")
 
 
-@app.get("/")
 def read_root():
     return {
         "message": "Welcome to the Task Management System API",
@@ -53,6 +85,11 @@ def read_root():
     }
 
 
+# When serving the frontend, "/" is its index.html
+if not settings.FRONTEND_DIST_DIR:
+    app.get("/")(read_root)
+
+
 @app.get("/health")
 def health_check(db: Session = Depends(get_db)):
     health_status = {"status": "healthy"}
@@ -105,10 +142,27 @@ def health_check(db: Session = Depends(get_db)):
             "url_configured": redis_url != "redis://localhost:6379/0",
             "url": mask_password_in_url(redis_url)
         }
+
+    # Without a broker, report the in-process job queue instead
+    if not uses_broker():
+        health_status["background_queue"] = in_process_queue.stats()
+    health_status["activity_log"] = activity_log.stats()
+    if settings.CONCURRENCY_LIMIT_ENABLED:
+        health_status["concurrency"] = concurrency_limiter.stats()
+    if settings.TRACING_ENABLED:
+        health_status["tracing"] = tracer.stats()
     
     return health_status
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Concurrency limiter gauges and counters in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics_text(concurrency_limiter.stats()), media_type="text/plain; version=0.0.4")
+
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up Task Management System API")
@@ -135,6 +189,35 @@ async def startup_event():
     logger.info(f"Environment variables loaded: DATABASE_URL and CELERY_BROKER_URL are {'configured' if db_url != 'sqlite:///./taskmanagement.db' and redis_url != 'redis://localhost:6379/0' else 'not fully configured'}")
     logger.info(f"Using settings from config: DATABASE_URL={db_url != 'sqlite:///./taskmanagement.db'}, CELERY_BROKER_URL={redis_url != 'redis://localhost:6379/0'}")
 
+    # Schema is managed by Alembic / `python -m app.db.init_db`; only create
+    # tables here when explicitly asked to (local development)
+    if settings.DB_CREATE_ALL_ON_STARTUP:
+        from app.db.init_db import init_db
+        init_db()
+        logger.info("Database tables created")
+
+    # Without a broker there is no Celery beat; run its schedule here
+    if not uses_broker() and settings.BACKGROUND_PERIODIC_JOBS:
+        periodic_jobs.start()
+
+    # Open pooled connections up front so the first requests don't pay for them
+    if settings.DB_POOL_PREWARM > 0:
+        try:
+            opened = prewarm_pool(settings.DB_POOL_PREWARM)
+            logger.info(f"Pre-warmed {opened} database connections")
+        except Exception as e:
+            logger.warning(f"Could not pre-warm database pool: {str(e)}")
+
+
+# Serve the built frontend on the same origin, so browsers skip CORS
+# preflights. It answers only what no route matched, after the router's
+# trailing-slash redirects (a Mount at "/" would match first and stop
+# GET /api/tasks from redirecting to /api/tasks/)
+if settings.FRONTEND_DIST_DIR:
+    from app.core.frontend import FrontendFiles
+
+    app.router.default = FrontendFiles(settings.FRONTEND_DIST_DIR)
+
 
 def mask_password_in_url(url):
     """Mask password in a URL for secure logging."""
@@ -150,4 +233,21 @@ def mask_password_in_url(url):
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    logger.info("Shutting down Task Management System API")
\ No newline at end of file
+    logger.info("Shutting down Task Management System API")
+    from starlette.concurrency import run_in_threadpool
+
+    # Give queued in-process jobs (e.g. notification emails) time to finish
+    if not uses_broker():
+        periodic_jobs.stop()
+        drained = await run_in_threadpool(in_process_queue.drain, settings.BACKGROUND_DRAIN_SECONDS)
+        stats = in_process_queue.stats()
+        if drained:
+            logger.info(f"Background queue drained: {stats}")
+        else:
+            logger.warning(f"Background queue not drained after {settings.BACKGROUND_DRAIN_SECONDS}s: {stats}")
+
+    # Write task history still buffered in memory
+    written = await run_in_threadpool(activity_log.close)
+    logger.info(f"Activity log flushed {written} records: {activity_log.stats()}")
+
+    shutdown_tracing()
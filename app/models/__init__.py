@@ -1,3 +1,7 @@
 from app.models.user import User
 from app.models.project import Project
-from app.models.task import Task, TaskStatus, TaskPriority
\ No newline at end of file
+from app.models.task import ArchivedTask, Task, TaskStatus, TaskPriority
+from app.models.reminder import TaskReminder, ReminderKind
+from app.models.task_import import ImportStatus, TaskImport
+from app.models.task_activity import ActivityAction, TaskActivity
+from app.models.task_sync import TaskChangeCounter, TaskTombstone
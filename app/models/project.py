@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -8,8 +8,13 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("user.id"), index=True, nullable=False)
+    # Set when a large project is queued for background deletion; hidden from the API
+    deleted_at = Column(DateTime, nullable=True)
     
     # Relationships
     owner = relationship("User", back_populates="projects")
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
\ No newline at end of file
+    # Tasks are removed by the database (ON DELETE CASCADE), not loaded and deleted one by one
+    tasks = relationship(
+        "Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
\ No newline at end of file
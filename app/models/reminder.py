@@ -0,0 +1,18 @@
+from enum import Enum as PyEnum
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer
+
+from app.db.base_class import Base
+
+
+class ReminderKind(str, PyEnum):
+    DUE_SOON = "DUE_SOON"
+    OVERDUE = "OVERDUE"
+
+
+class TaskReminder(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("task.id", ondelete="CASCADE"), index=True, nullable=False)
+    kind = Column(Enum(ReminderKind), nullable=False)
+    # The dispatcher scans this index for reminders that are due
+    fire_at = Column(DateTime, index=True, nullable=False)
@@ -1,7 +1,9 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Enum, FetchedValue, ForeignKey, Index, Integer, SmallInteger, String, Text, event,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -19,20 +21,76 @@ class TaskPriority(str, PyEnum):
     HIGH = "HIGH"
 
 
+# Urgency order of priorities. Stored on each task as priority_rank so
+# "most urgent first" sorts numerically and can be read off an index
+PRIORITY_RANK = {
+    TaskPriority.LOW: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.HIGH: 3,
+}
+
+
 class Task(Base):
+    __table_args__ = (
+        # Serves the archival sweep for old DONE tasks
+        Index("ix_task_status_updated_at", "status", "updated_at"),
+        # Task lists are always scoped to the owner, usually filtered by status
+        Index("ix_task_owner_id_status_due_date", "owner_id", "status", "due_date"),
+        # Incremental refreshes (?updated_since=)
+        Index("ix_task_owner_id_updated_at", "owner_id", "updated_at"),
+        # sort=priority pages, with id as the tie-breaker
+        Index("ix_task_owner_id_priority_rank_id", "owner_id", "priority_rank", "id"),
+        Index("ix_task_project_id_priority_rank_id", "project_id", "priority_rank", "id"),
+        # Delta sync: an owner's changes after a cursor
+        Index("ix_task_owner_id_change_seq", "owner_id", "change_seq"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
+    # Kept in step with `priority` (see PRIORITY_RANK)
+    priority_rank = Column(SmallInteger, default=PRIORITY_RANK[TaskPriority.MEDIUM], nullable=False)
     due_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Foreign keys
-    project_id = Column(Integer, ForeignKey("project.id"), nullable=False)
-    assigned_user_id = Column(Integer, ForeignKey("user.id"), nullable=True)
+    project_id = Column(Integer, ForeignKey("project.id", ondelete="CASCADE"), index=True, nullable=False)
+    assigned_user_id = Column(Integer, ForeignKey("user.id"), index=True, nullable=True)
+    # Copy of project.owner_id so ownership checks don't need to join project
+    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    # Position in the owner's change sequence; set by a database trigger on
+    # every insert and update (see app/models/task_sync.py)
+    change_seq = Column(BigInteger, server_default="0", server_onupdate=FetchedValue(), nullable=False)
     
     # Relationships
     project = relationship("Project", back_populates="tasks")
-    assigned_user = relationship("User", back_populates="tasks")
\ No newline at end of file
+    assigned_user = relationship("User", back_populates="tasks", foreign_keys=[assigned_user_id])
+
+
+class ArchivedTask(Base):
+    """
+    DONE tasks moved out of the hot `task` table by the archival job.
+    Same columns as Task plus archived_at; read-only through the API.
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(Enum(TaskStatus), nullable=False)
+    priority = Column(Enum(TaskPriority), nullable=False)
+    priority_rank = Column(SmallInteger, nullable=False)
+    due_date = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    project_id = Column(Integer, ForeignKey("project.id", ondelete="CASCADE"), index=True, nullable=False)
+    assigned_user_id = Column(Integer, ForeignKey("user.id"), nullable=True)
+    owner_id = Column(Integer, ForeignKey("user.id"), index=True, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+@event.listens_for(Task, "before_insert")
+@event.listens_for(Task, "before_update")
+def _sync_priority_rank(mapper, connection, target):
+    target.priority_rank = PRIORITY_RANK[target.priority or TaskPriority.MEDIUM]
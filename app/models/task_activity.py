@@ -0,0 +1,33 @@
+from enum import Enum as PyEnum
+
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Index, Integer
+
+from app.db.base_class import Base
+
+
+class ActivityAction(str, PyEnum):
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    DELETED = "DELETED"
+
+
+class TaskActivity(Base):
+    """
+    One change to a task, written in batches by app.services.activity.
+    `task_id` has no foreign key: history outlives the task, and records
+    may be flushed after the task is gone.
+    """
+    __table_args__ = (
+        # History of one task, newest first
+        Index("ix_taskactivity_task_id_id", "task_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    actor_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    action = Column(Enum(ActivityAction), nullable=False)
+    # {field: [old, new]}; CREATED has no old values, DELETED no new ones
+    changes = Column(JSON, nullable=False)
+    # When the change was made, not when the record was flushed
+    created_at = Column(DateTime, nullable=False)
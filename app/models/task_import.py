@@ -0,0 +1,33 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Enum, ForeignKey, Integer, String
+
+from app.db.base_class import Base
+
+
+class ImportStatus(str, PyEnum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class TaskImport(Base):
+    """
+    A bulk task import: the uploaded file is spooled to `file_path` and
+    loaded by a background job, which records its progress here.
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("user.id"), index=True, nullable=False)
+    format = Column(String, nullable=False)
+    status = Column(Enum(ImportStatus), default=ImportStatus.PENDING, nullable=False)
+    file_path = Column(String, nullable=True)
+    bytes_total = Column(BigInteger, default=0, nullable=False)
+    bytes_processed = Column(BigInteger, default=0, nullable=False)
+    rows_imported = Column(Integer, default=0, nullable=False)
+    rows_failed = Column(Integer, default=0, nullable=False)
+    # First IMPORT_MAX_ERRORS row errors as {"line": n, "error": "..."}
+    errors = Column(JSON, default=list, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,118 @@
+from sqlalchemy import DDL, BigInteger, Column, DateTime, ForeignKey, Index, Integer, event
+
+from app.db.base_class import Base
+
+
+class TaskChangeCounter(Base):
+    """
+    Last change sequence number handed out per task owner. Triggers bump
+    it on every task insert, update and delete; the row lock is held until
+    the writing transaction commits, so an owner's sequence numbers become
+    visible in order and a sync cursor can never skip a late commit.
+    """
+    owner_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    seq = Column(BigInteger, nullable=False)
+
+
+class TaskTombstone(Base):
+    """
+    A deleted (or archived) task, kept for delta sync clients until
+    SYNC_TOMBSTONE_DAYS have passed. Written by a trigger on task.
+    """
+    __table_args__ = (
+        Index("ix_tasktombstone_owner_id_change_seq", "owner_id", "change_seq"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    owner_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, index=True, nullable=False)
+
+
+# Triggers maintaining task.change_seq and task tombstones. The Alembic
+# migration (010) creates the same objects on existing databases.
+POSTGRESQL_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION task_next_change_seq(owner integer) RETURNS bigint AS $$
+        INSERT INTO taskchangecounter (owner_id, seq) VALUES (owner, 1)
+        ON CONFLICT (owner_id) DO UPDATE SET seq = taskchangecounter.seq + 1
+        RETURNING seq
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION task_set_change_seq() RETURNS trigger AS $$
+    BEGIN
+        NEW.change_seq := task_next_change_seq(NEW.owner_id);
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION task_record_tombstone() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO tasktombstone (task_id, owner_id, change_seq, deleted_at)
+        VALUES (OLD.id, OLD.owner_id, task_next_change_seq(OLD.owner_id), now() AT TIME ZONE 'utc');
+        RETURN OLD;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS task_change_seq ON task",
+    """
+    CREATE TRIGGER task_change_seq BEFORE INSERT OR UPDATE ON task
+    FOR EACH ROW EXECUTE FUNCTION task_set_change_seq()
+    """,
+    "DROP TRIGGER IF EXISTS task_tombstone ON task",
+    """
+    CREATE TRIGGER task_tombstone AFTER DELETE ON task
+    FOR EACH ROW EXECUTE FUNCTION task_record_tombstone()
+    """,
+]
+
+# SQLite triggers can't assign NEW, so the row is updated after the fact
+# (triggers don't fire recursively unless recursive_triggers is on; the
+# WHEN clause guards against that anyway)
+_SQLITE_BUMP = (
+    "INSERT INTO taskchangecounter (owner_id, seq) VALUES ({row}.owner_id, 1) "
+    "ON CONFLICT (owner_id) DO UPDATE SET seq = seq + 1;"
+)
+_SQLITE_SET_SEQ = (
+    "UPDATE task SET change_seq = (SELECT seq FROM taskchangecounter WHERE owner_id = NEW.owner_id) "
+    "WHERE id = NEW.id;"
+)
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_change_seq_insert AFTER INSERT ON task
+    BEGIN
+        {_SQLITE_BUMP.format(row="NEW")}
+        {_SQLITE_SET_SEQ}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_change_seq_update AFTER UPDATE ON task
+    WHEN NEW.change_seq IS OLD.change_seq
+    BEGIN
+        {_SQLITE_BUMP.format(row="NEW")}
+        {_SQLITE_SET_SEQ}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_tombstone AFTER DELETE ON task
+    BEGIN
+        {_SQLITE_BUMP.format(row="OLD")}
+        INSERT INTO tasktombstone (task_id, owner_id, change_seq, deleted_at)
+        VALUES (
+            OLD.id, OLD.owner_id,
+            (SELECT seq FROM taskchangecounter WHERE owner_id = OLD.owner_id),
+            strftime('%Y-%m-%d %H:%M:%f000', 'now')
+        );
+    END
+    """,
+]
+
+# After create_all, once task and the tables the triggers write to exist.
+# DDL %-formats its statement, hence the escaping
+for _statement in POSTGRESQL_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_statement.replace("%", "%%")).execute_if(dialect="postgresql"))
+for _statement in SQLITE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_statement.replace("%", "%%")).execute_if(dialect="sqlite"))
@@ -14,4 +14,4 @@ class User(Base):
     
     # DB relations - links to user's projects and tasks
     projects = relationship("Project", back_populates="owner")
-    tasks = relationship("Task", back_populates="assigned_user")
\ No newline at end of file
+    tasks = relationship("Task", back_populates="assigned_user", foreign_keys="Task.assigned_user_id")
\ No newline at end of file
@@ -1,4 +1,7 @@
 from app.schemas.user import User, UserCreate, UserUpdate, UserInDB
 from app.schemas.project import Project, ProjectCreate, ProjectUpdate, ProjectWithTasks
-from app.schemas.task import Task, TaskCreate, TaskUpdate
+from app.schemas.task import Task, TaskCreate, TaskPage, TaskUpdate
+from app.schemas.task_import import TaskImport
+from app.schemas.task_activity import TaskActivity
+from app.schemas.task_sync import TaskChanges, TaskTombstone
 from app.schemas.auth import Token, TokenPayload
\ No newline at end of file
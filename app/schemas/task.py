@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -49,4 +49,14 @@ class Task(TaskInDBBase):
 
 # Properties stored in DB
 class TaskInDB(TaskInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+
+# Paginated list of tasks with a total for pagers
+class TaskPage(BaseModel):
+    items: List[Task]
+    total: int
+    # False when the total is an estimate (large result sets)
+    total_is_exact: bool
+    page: int
+    limit: int
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+from app.models.task_activity import ActivityAction
+
+
+# One entry of a task's history
+class TaskActivity(BaseModel):
+    id: int
+    task_id: int
+    actor_id: int
+    action: ActivityAction
+    changes: Dict[str, List[Any]]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
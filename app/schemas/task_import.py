@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.models.task_import import ImportStatus
+
+
+# Progress of a bulk task import
+class TaskImport(BaseModel):
+    id: int
+    format: str
+    status: ImportStatus
+    bytes_total: int
+    bytes_processed: int
+    rows_imported: int
+    rows_failed: int
+    errors: List[Dict[str, Any]]
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
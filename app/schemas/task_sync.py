@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.task import Task
+
+
+# A task deleted (or archived) since the sync token
+class TaskTombstone(BaseModel):
+    task_id: int
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# One page of changes for delta sync
+class TaskChanges(BaseModel):
+    tasks: List[Task]
+    deleted: List[TaskTombstone]
+    # Pass as `since` on the next call
+    next_token: str
+    # True when more changes are waiting; call again right away
+    has_more: bool
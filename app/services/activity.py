@@ -0,0 +1,173 @@
+import logging
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app import models
+from app.core.config import settings
+from app.db.session import session_scope
+from app.models.task_activity import ActivityAction
+
+logger = logging.getLogger(__name__)
+
+# Fields recorded when a task is created or deleted
+TRACKED_FIELDS = (
+    "title", "description", "status", "priority", "due_date", "project_id", "assigned_user_id",
+)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def field_changes(task: models.Task, update_data: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """
+    [old, new] for each field of `update_data` that differs from the task.
+    Call before applying the update.
+    """
+    return {
+        field: [_jsonable(getattr(task, field)), _jsonable(value)]
+        for field, value in update_data.items()
+        if getattr(task, field) != value
+    }
+
+
+def task_snapshot(task: models.Task, action: ActivityAction) -> Dict[str, List[Any]]:
+    """
+    The task's set fields as changes from (CREATED) or to (DELETED) nothing.
+    """
+    changes = {}
+    for field in TRACKED_FIELDS:
+        value = getattr(task, field)
+        if value is not None:
+            value = _jsonable(value)
+            changes[field] = [None, value] if action == ActivityAction.CREATED else [value, None]
+    return changes
+
+
+class TaskActivityLog:
+    """
+    In-memory buffer of task change records, written with one bulk INSERT
+    per flush so the write endpoints don't pay for an extra statement.
+    A daemon thread flushes every `flush_seconds`, or as soon as
+    `flush_size` records are pending. At most `max_size` records are held;
+    beyond that (e.g. while the database is unreachable) new records are
+    dropped and counted. Records still buffered when the process dies
+    without a clean shutdown are lost.
+    """
+
+    def __init__(self, flush_size: int, flush_seconds: float, max_size: int) -> None:
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.max_size = max_size
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        # Serializes flushes from the thread, the history endpoint and shutdown
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._accepting = True
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="activity-log", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def record(
+        self,
+        task_id: int,
+        owner_id: int,
+        actor_id: int,
+        action: ActivityAction,
+        changes: Dict[str, List[Any]],
+    ) -> bool:
+        """
+        Buffer one change. Returns False if it was dropped.
+        """
+        if not settings.ACTIVITY_LOG_ENABLED:
+            return False
+        entry = {
+            "task_id": task_id,
+            "owner_id": owner_id,
+            "actor_id": actor_id,
+            "action": action,
+            "changes": changes,
+            "created_at": datetime.utcnow(),
+        }
+        with self._lock:
+            if not self._accepting or len(self._pending) >= self.max_size:
+                self.dropped += 1
+                logger.warning(f"Dropped activity record for task {task_id}: buffer full or closed")
+                return False
+            self._pending.append(entry)
+            self.recorded += 1
+            full = len(self._pending) >= self.flush_size
+        self._start()
+        if full:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Insert all pending records. Returns how many were written; on a
+        database error they are put back for the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if not entries:
+                return 0
+            try:
+                with session_scope() as db:
+                    db.execute(insert(models.TaskActivity), entries)
+                    db.commit()
+            except Exception as e:
+                logger.error(f"Could not write {len(entries)} activity records: {str(e)}")
+                with self._lock:
+                    # Oldest first, within the bound
+                    keep = entries[:max(self.max_size - len(self._pending), 0)]
+                    self.dropped += len(entries) - len(keep)
+                    self._pending[:0] = keep
+                return 0
+            self.flushed += len(entries)
+            return len(entries)
+
+    def close(self) -> int:
+        """
+        Stop accepting records and write the pending ones (on shutdown).
+        """
+        with self._lock:
+            self._accepting = False
+        return self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "max_size": self.max_size,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+        }
+
+
+activity_log = TaskActivityLog(
+    settings.ACTIVITY_FLUSH_SIZE, settings.ACTIVITY_FLUSH_SECONDS, settings.ACTIVITY_BUFFER_SIZE
+)
@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models.task import TaskStatus
+from app.services.task_counts import invalidate_task_counts
+
+
+def archived_columns() -> List[str]:
+    """
+    Columns shared by the live and archive task tables.
+    """
+    live = models.Task.__table__.c
+    return [column.name for column in models.ArchivedTask.__table__.columns if column.name in live]
+
+
+def archive_tasks_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """
+    Move up to `batch_size` DONE tasks last updated before `cutoff` into
+    the archive table in one short transaction. Returns the rows moved.
+    """
+    task_table = models.Task.__table__
+    query = (
+        db.query(models.Task.id, models.Task.owner_id)
+        .filter(models.Task.status == TaskStatus.DONE, models.Task.updated_at < cutoff)
+        .order_by(models.Task.updated_at)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    rows = query.all()
+    if not rows:
+        return 0
+    task_ids = [row.id for row in rows]
+
+    columns = archived_columns()
+    db.execute(
+        insert(models.ArchivedTask.__table__).from_select(
+            columns + ["archived_at"],
+            select(*[task_table.c[name] for name in columns], literal(datetime.utcnow()))
+            .where(task_table.c.id.in_(task_ids)),
+        )
+    )
+    db.query(models.Task).filter(models.Task.id.in_(task_ids)).delete(synchronize_session=False)
+    db.commit()
+    for owner_id in {row.owner_id for row in rows}:
+        invalidate_task_counts(owner_id)
+    return len(task_ids)
+
+
+def task_table_sizes(db: Session) -> Dict[str, int]:
+    """
+    Table and index sizes in bytes of the live and archive tables
+    (PostgreSQL only; empty elsewhere).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return {}
+    row = db.execute(text(
+        "SELECT pg_table_size('task'), pg_indexes_size('task'), "
+        "pg_table_size('archivedtask'), pg_indexes_size('archivedtask')"
+    )).one()
+    return {
+        "task_table": row[0],
+        "task_indexes": row[1],
+        "archive_table": row[2],
+        "archive_indexes": row[3],
+    }
@@ -0,0 +1,190 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.tracing import traced_job
+
+logger = logging.getLogger(__name__)
+
+
+def celery_tasks():
+    """
+    Import the Celery task module on first use so the API process doesn't
+    load Celery and the email stack at startup.
+    """
+    from app.worker import celery_app  # noqa: F401 - configures the current Celery app
+    from app.services import tasks
+
+    return tasks
+
+
+def uses_broker() -> bool:
+    """
+    True when Celery has a Redis broker to publish to (see app/worker.py).
+    """
+    return bool(settings.CELERY_BROKER_URL) and "redis" in settings.CELERY_BROKER_URL
+
+
+class InProcessQueue:
+    """
+    Bounded job queue served by a few daemon threads, used instead of
+    Celery when there is no broker. Jobs that don't fit in the queue are
+    dropped and counted rather than run on the request path.
+    """
+
+    def __init__(self, workers: int, max_size: int) -> None:
+        self.workers = workers
+        self.max_size = max_size
+        self._queue: "queue.Queue[Tuple[str, Callable, tuple]]" = queue.Queue(maxsize=max_size)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._accepting = True
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run, name=f"background-{index}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self) -> None:
+        while True:
+            name, func, args = self._queue.get()
+            try:
+                func(*args)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Background job {name} failed: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, name: str, func: Callable, *args: Any) -> bool:
+        """
+        Queue `func(*args)`. Returns False if the job was dropped.
+        """
+        if not self._accepting:
+            self.dropped += 1
+            logger.warning(f"Dropped background job {name}: shutting down")
+            return False
+        self._start()
+        try:
+            self._queue.put_nowait((name, func, args))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Dropped background job {name}: queue full ({self.max_size})")
+            return False
+        self.submitted += 1
+        return True
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Stop accepting jobs and wait up to `timeout` seconds for queued ones
+        to finish. Returns True if the queue emptied in time.
+        """
+        self._accepting = False
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # Worker threads are daemons and exit with the process
+        return not self._queue.unfinished_tasks
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "max_size": self.max_size,
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+
+in_process_queue = InProcessQueue(settings.BACKGROUND_WORKERS, settings.BACKGROUND_QUEUE_SIZE)
+
+
+class PeriodicJobs:
+    """
+    Runs the Celery beat schedule (app/worker.py) on the in-process queue
+    when there is no broker, and so no beat. Like beat, each job runs once
+    at startup and then every `schedule` seconds; a run is skipped while
+    the previous one is still queued or running.
+    """
+
+    def __init__(self, jobs: InProcessQueue) -> None:
+        self.jobs = jobs
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="periodic-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _submit(self, name: str) -> None:
+        with self._lock:
+            if name in self._running:
+                return
+            self._running.add(name)
+        job = traced_job(name, getattr(celery_tasks(), name))
+
+        def run() -> None:
+            try:
+                job()
+            finally:
+                with self._lock:
+                    self._running.discard(name)
+
+        if not self.jobs.submit(name, run):
+            with self._lock:
+                self._running.discard(name)
+
+    def _run(self) -> None:
+        from app.worker import celery_app
+
+        intervals = {
+            entry["task"].rsplit(".", 1)[-1]: float(entry["schedule"])
+            for entry in celery_app.conf.beat_schedule.values()
+        }
+        next_run = dict.fromkeys(intervals, time.monotonic())
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for name, interval in intervals.items():
+                if next_run[name] <= now:
+                    next_run[name] = now + interval
+                    self._submit(name)
+            self._stop.wait(max(0.0, min(next_run.values()) - time.monotonic()))
+
+
+periodic_jobs = PeriodicJobs(in_process_queue)
+
+
+def enqueue(task_name: str, *args: Any) -> None:
+    """
+    Run the Celery task `task_name` in the background: through the broker
+    when there is one, otherwise on the in-process queue.
+    """
+    task = getattr(celery_tasks(), task_name)
+    if uses_broker():
+        task.delay(*args)
+    else:
+        # Calling the task object runs it synchronously in the queue's thread
+        in_process_queue.submit(task_name, traced_job(task_name, task), *args)
@@ -1,11 +1,9 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import emails
-from emails.template import JinjaTemplate
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import settings
+from app.core.tracing import CLIENT, tracer
 
 
 def send_email(
@@ -18,6 +16,10 @@ def send_email(
     Send an email using the configured SMTP server.
     """
     assert settings.EMAILS_FROM_EMAIL
+    # Imported here so the API process only loads `emails` when it sends mail
+    import emails
+    from emails.template import JinjaTemplate
+
     message = emails.Message(
         subject=JinjaTemplate(subject_template),
         html=JinjaTemplate(html_template),
@@ -30,7 +32,18 @@ def send_email(
         smtp_options["user"] = settings.SMTP_USER
     if settings.SMTP_PASSWORD:
         smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, render=environment, smtp=smtp_options)
+    with tracer.span(
+        "smtp send",
+        CLIENT,
+        attributes={"server.address": settings.SMTP_HOST, "server.port": settings.SMTP_PORT},
+        root=False,
+    ) as span:
+        response = message.send(to=email_to, render=environment, smtp=smtp_options)
+        if span is not None:
+            span.set_attribute("smtp.status_code", response.status_code)
+            if not response.success:
+                span.status = "ERROR"
+                span.error = str(response.error)
     logging.info(f"Send email result: {response}")
 
 
@@ -83,16 +96,40 @@ def send_task_status_changed_email(
     )
 
 
-def send_overdue_tasks_summary_email(
+def send_task_reminder_email(
     email_to: str,
-    overdue_tasks: List[Dict[str, Any]],
+    task_title: str,
+    project_name: str,
+    due_date: str,
+    overdue: bool,
 ) -> None:
     """
-    Send a daily summary email of overdue tasks.
+    Send a reminder that a task is due soon or has just become overdue.
+    """
+    if overdue:
+        subject = f"Task Overdue: {task_title}"
+        intro = "A task assigned to you is now overdue:"
+    else:
+        subject = f"Task Due Soon: {task_title}"
+        intro = "A task assigned to you is due soon:"
+    html_template = f"""
+    <p>{intro}</p>
+    <p><strong>Task:</strong> {task_title}</p>
+    <p><strong>Project:</strong> {project_name}</p>
+    <p><strong>Due Date:</strong> {due_date}</p>
+    <p>Please log in to the Task Management System to view more details.</p>
+    """
+    send_email(
+        email_to=email_to,
+        subject_template=subject,
+        html_template=html_template,
+    )
+
+
+def render_overdue_tasks_summary(overdue_tasks: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Build the subject and HTML body of the daily overdue tasks summary.
     """
-    if not overdue_tasks:
-        return
-    
     subject = "Daily Summary: Overdue Tasks"
     
     tasks_html = ""
@@ -119,9 +156,22 @@ def send_overdue_tasks_summary_email(
     </table>
     <p>Please log in to the Task Management System to update these tasks.</p>
     """
+    return subject, html_template
+
+
+def send_overdue_tasks_summary_email(
+    email_to: str,
+    overdue_tasks: List[Dict[str, Any]],
+) -> None:
+    """
+    Send a daily summary email of overdue tasks.
+    """
+    if not overdue_tasks:
+        return
     
+    subject, html_template = render_overdue_tasks_summary(overdue_tasks)
     send_email(
         email_to=email_to,
         subject_template=subject,
         html_template=html_template,
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import redis_url, settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "task_events:"
+
+
+class LocalBroker:
+    """
+    In-memory fan-out of events to the SSE connections of this process,
+    keyed by the user who owns the affected project. `publish` is safe to
+    call from the threadpool that runs sync endpoints.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        self._deliver(user_id, json.dumps(event))
+
+    def _deliver(self, user_id: int, message: str) -> None:
+        queues = self._subscribers.get(user_id)
+        if not queues or self._loop is None:
+            return
+        for queue in list(queues):
+            self._loop.call_soon_threadsafe(self._put, queue, message)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, message: str) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A stalled client loses events rather than growing memory
+            pass
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    async def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> bool:
+        """
+        Remove a connection's queue. Returns True if it was the user's last one.
+        """
+        queues = self._subscribers.get(user_id)
+        if not queues:
+            return False
+        queues.discard(queue)
+        if queues:
+            return False
+        del self._subscribers[user_id]
+        return True
+
+    def connection_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+class RedisBroker(LocalBroker):
+    """
+    Publishes events to Redis so every API worker sees them. Each worker
+    holds one pub/sub connection and subscribes to a user's channel only
+    while that user has an open stream on it.
+    """
+
+    def __init__(self, url: str, queue_size: int) -> None:
+        super().__init__(queue_size)
+        self.url = url
+        self._publisher = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def publish(self, user_id: int, event: Dict[str, Any]) -> None:
+        if self._publisher is None:
+            import redis
+
+            self._publisher = redis.from_url(self.url, socket_timeout=1)
+        self._publisher.publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(event))
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = await super().subscribe(user_id)
+        if len(self._subscribers[user_id]) == 1:
+            try:
+                await self._get_pubsub().subscribe(f"{CHANNEL_PREFIX}{user_id}")
+            except Exception:
+                # Don't leave a queue behind that nothing will ever feed
+                await super().unsubscribe(user_id, queue)
+                raise
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return queue
+
+    async def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> bool:
+        last = await super().unsubscribe(user_id, queue)
+        if last and self._pubsub is not None:
+            await self._pubsub.unsubscribe(f"{CHANNEL_PREFIX}{user_id}")
+        return last
+
+    def _get_pubsub(self):
+        if self._pubsub is None:
+            import redis.asyncio as aioredis
+
+            self._pubsub = aioredis.from_url(self.url).pubsub(ignore_subscribe_messages=True)
+        return self._pubsub
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except Exception as e:
+                logger.warning(f"Event listener lost Redis connection: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+            if message is None:
+                if not self._subscribers:
+                    return
+                continue
+            channel = message["channel"].decode()
+            data = message["data"]
+            self._deliver(int(channel[len(CHANNEL_PREFIX):]), data.decode() if isinstance(data, bytes) else data)
+
+
+def _create_broker() -> LocalBroker:
+    url = redis_url(settings.EVENTS_REDIS_URL)
+    if url:
+        return RedisBroker(url, settings.EVENTS_QUEUE_SIZE)
+    return LocalBroker(settings.EVENTS_QUEUE_SIZE)
+
+
+broker = _create_broker()
+
+
+def publish_task_event(event_type: str, owner_id: int, payload: Dict[str, Any]) -> None:
+    """
+    Publish a task change to the project owner's event streams. Never
+    raises; a lost event only means clients fall back to refetching.
+    """
+    try:
+        broker.publish(owner_id, {"type": event_type, **payload})
+    except Exception as e:
+        logger.warning(f"Could not publish {event_type} event: {str(e)}")
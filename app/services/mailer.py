@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.tracing import CLIENT, tracer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutgoingEmail:
+    email_to: str
+    subject: str
+    html: str
+
+
+@dataclass
+class DeliveryStats:
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    connections: int = 0
+    elapsed: float = 0.0
+    # Seconds per successful send, including any reconnect it needed
+    latencies: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "connections": self.connections,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "messages_per_second": round(self.sent / self.elapsed, 1) if self.elapsed else 0.0,
+            "latency_p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+            "latency_p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000, 1) if latencies else None,
+        }
+
+
+def is_transient(exc: Exception) -> bool:
+    """
+    Whether a failed send is worth retrying: dropped or refused
+    connections, timeouts and 4xx replies.
+    """
+    import aiosmtplib
+
+    if isinstance(exc, aiosmtplib.SMTPRecipientsRefused):
+        return all(400 <= error.code < 500 for error in exc.recipients)
+    if isinstance(exc, aiosmtplib.SMTPResponseException):
+        return 400 <= exc.code < 500
+    return isinstance(exc, (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, aiosmtplib.SMTPTimeoutError, OSError, asyncio.TimeoutError))
+
+
+class SMTPDelivery:
+    """
+    Sends a batch of emails over up to `concurrency` SMTP connections.
+    Each connection is reused for up to `messages_per_connection` messages
+    so the TCP/TLS/AUTH handshake is paid once per connection rather than
+    once per message. Transient failures are retried with exponential
+    backoff and jitter; permanent ones (5xx) are counted and skipped.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        from_address: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = False,
+        concurrency: int = 10,
+        messages_per_connection: int = 100,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.from_address = from_address
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.concurrency = max(1, concurrency)
+        self.messages_per_connection = max(1, messages_per_connection)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+
+    @classmethod
+    def from_settings(cls) -> "SMTPDelivery":
+        assert settings.SMTP_HOST and settings.EMAILS_FROM_EMAIL
+        return cls(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT or 587,
+            from_address=formataddr((settings.EMAILS_FROM_NAME or "", settings.EMAILS_FROM_EMAIL)),
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            start_tls=settings.SMTP_TLS,
+            concurrency=settings.SMTP_CONCURRENCY,
+            messages_per_connection=settings.SMTP_MESSAGES_PER_CONNECTION,
+            max_retries=settings.SMTP_MAX_RETRIES,
+            backoff_seconds=settings.SMTP_RETRY_BACKOFF_SECONDS,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+
+    def build_message(self, email: OutgoingEmail) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.from_address
+        message["To"] = email.email_to
+        message["Subject"] = email.subject
+        message.set_content(email.html, subtype="html")
+        return message
+
+    async def deliver(self, emails: Iterable[OutgoingEmail]) -> DeliveryStats:
+        queue: asyncio.Queue = asyncio.Queue()
+        for email in emails:
+            queue.put_nowait((email, 0))
+        stats = DeliveryStats()
+        started = time.perf_counter()
+        workers = min(self.concurrency, queue.qsize())
+        with tracer.span("smtp deliver", attributes={"email.count": queue.qsize()}, root=False) as span:
+            await asyncio.gather(*(self._worker(queue, stats) for _ in range(workers)))
+            if span is not None:
+                span.attributes.update(
+                    {"email.sent": stats.sent, "email.failed": stats.failed, "email.retries": stats.retries}
+                )
+        stats.elapsed = time.perf_counter() - started
+        return stats
+
+    async def _connect(self):
+        import aiosmtplib
+
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await smtp.connect()
+        if self.username and self.password:
+            try:
+                await smtp.login(self.username, self.password)
+            except Exception:
+                smtp.close()
+                raise
+        return smtp
+
+    @staticmethod
+    async def _close(smtp) -> None:
+        if smtp is None:
+            return
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def _worker(self, queue: asyncio.Queue, stats: DeliveryStats) -> None:
+        import aiosmtplib
+
+        smtp = None
+        sent_on_connection = 0
+        try:
+            while True:
+                try:
+                    email, attempt = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if smtp is not None and sent_on_connection >= self.messages_per_connection:
+                    await self._close(smtp)
+                    smtp = None
+                started = time.perf_counter()
+                try:
+                    if smtp is None:
+                        connect_attributes = {"server.address": self.hostname, "server.port": self.port}
+                        with tracer.span("smtp connect", CLIENT, attributes=connect_attributes, root=False):
+                            smtp = await self._connect()
+                        stats.connections += 1
+                        sent_on_connection = 0
+                    with tracer.span("smtp send", CLIENT, attributes={"smtp.attempt": attempt}, root=False):
+                        await smtp.send_message(self.build_message(email))
+                    sent_on_connection += 1
+                    stats.sent += 1
+                    stats.latencies.append(time.perf_counter() - started)
+                except Exception as e:
+                    # After a rejected message the session is still usable;
+                    # after anything else its state is unknown
+                    if not isinstance(e, (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)):
+                        await self._close(smtp)
+                        smtp = None
+                    if attempt < self.max_retries and is_transient(e):
+                        stats.retries += 1
+                        await asyncio.sleep(self.backoff_seconds * 2 ** attempt * random.uniform(0.5, 1.5))
+                        queue.put_nowait((email, attempt + 1))
+                    else:
+                        stats.failed += 1
+                        logger.warning(f"Could not send email to {email.email_to}: {str(e)}")
+        finally:
+            await self._close(smtp)
+
+
+def deliver_emails(emails: List[OutgoingEmail]) -> DeliveryStats:
+    """
+    Send `emails` concurrently with the configured SMTP settings. Blocking;
+    meant for Celery tasks and other code without a running event loop.
+    """
+    stats = asyncio.run(SMTPDelivery.from_settings().deliver(emails))
+    logger.info(f"Email delivery: {stats.summary()}")
+    return stats
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.models.reminder import ReminderKind
+from app.models.task import TaskStatus
+
+
+def schedule_task_reminders(db: Session, task: models.Task) -> None:
+    """
+    Replace the task's pending reminders to match its due date and status.
+    Called inside the request's transaction; the caller commits.
+    """
+    db.query(models.TaskReminder).filter(
+        models.TaskReminder.task_id == task.id
+    ).delete(synchronize_session=False)
+
+    if not task.due_date or task.status == TaskStatus.DONE:
+        return
+
+    now = datetime.utcnow()
+    due_soon_at = task.due_date - timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+    if due_soon_at > now:
+        db.add(models.TaskReminder(task_id=task.id, kind=ReminderKind.DUE_SOON, fire_at=due_soon_at))
+    if task.due_date > now:
+        db.add(models.TaskReminder(task_id=task.id, kind=ReminderKind.OVERDUE, fire_at=task.due_date))
+
+
+def pop_due_reminders(db: Session, now: datetime, limit: int, send: Callable[[int, str], None]) -> int:
+    """
+    Pass up to `limit` reminders due at `now`, oldest first, to
+    `send(task_id, kind)`, deleting each one only after `send` returns.
+    If `send` raises, the reminders already sent are deleted and the rest
+    stay for the next poll. Returns the number sent. Concurrent dispatchers
+    skip each other's rows on PostgreSQL.
+    """
+    query = (
+        db.query(models.TaskReminder)
+        .filter(models.TaskReminder.fire_at <= now)
+        .order_by(models.TaskReminder.fire_at)
+        .limit(limit)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    reminders = query.all()
+    if not reminders:
+        return 0
+
+    sent: List[int] = []
+    try:
+        for reminder in reminders:
+            send(reminder.task_id, reminder.kind.value)
+            sent.append(reminder.id)
+    finally:
+        if sent:
+            db.query(models.TaskReminder).filter(
+                models.TaskReminder.id.in_(sent)
+            ).delete(synchronize_session=False)
+        db.commit()
+    return len(sent)
+
+
+def schedule_reminders_for_new_tasks(db: Session, owner_id: int, first_task_id: int, batch_size: int) -> int:
+    """
+    Create reminders for `owner_id`'s tasks with ids from `first_task_id`
+    that have none yet, e.g. after a bulk import that bypassed
+    schedule_task_reminders. Walks the tasks in id order, one transaction
+    per batch. Returns the reminders created.
+    """
+    now = datetime.utcnow()
+    lead = timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+    has_reminder = db.query(models.TaskReminder.id).filter(
+        models.TaskReminder.task_id == models.Task.id
+    ).exists()
+    created = 0
+    last_id = first_task_id - 1
+    while True:
+        tasks = (
+            db.query(models.Task.id, models.Task.due_date)
+            .filter(
+                models.Task.owner_id == owner_id,
+                models.Task.id > last_id,
+                models.Task.due_date > now,
+                models.Task.status != TaskStatus.DONE,
+                ~has_reminder,
+            )
+            .order_by(models.Task.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not tasks:
+            return created
+        reminders = []
+        for task_id, due_date in tasks:
+            if due_date - lead > now:
+                reminders.append({"task_id": task_id, "kind": ReminderKind.DUE_SOON, "fire_at": due_date - lead})
+            reminders.append({"task_id": task_id, "kind": ReminderKind.OVERDUE, "fire_at": due_date})
+        db.bulk_insert_mappings(models.TaskReminder, reminders)
+        db.commit()
+        created += len(reminders)
+        last_id = tasks[-1].id
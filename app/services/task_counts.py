@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import redis_url, settings
+
+logger = logging.getLogger(__name__)
+
+_cache: "OrderedDict[Hashable, Tuple[float, int, bool]]" = OrderedDict()
+_lock = threading.Lock()
+MAX_CACHED_COUNTS = 10000
+
+# How long to stay on the in-process generations after Redis fails
+REDIS_RETRY_SECONDS = 30
+
+
+class CountGenerations:
+    """
+    Per-owner generation numbers, bumped on every task write by the API or
+    a Celery job and made part of the count cache key, so a write makes
+    that owner's cached counts unreachable in every process. Kept in Redis,
+    falling back to an in-process dict when Redis is not configured or
+    unreachable (other processes then see the write only by TTL).
+    """
+
+    def __init__(self, redis_url: Optional[str]) -> None:
+        self.redis_url = redis_url
+        self._redis = None
+        self._redis_down_until = 0.0
+        self._local: Dict[int, int] = {}
+
+    def _client(self):
+        if self.redis_url is None or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.from_url(self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        return self._redis
+
+    def _redis_failed(self, e: Exception) -> None:
+        logger.warning(f"Task count cache falling back to in-process generations: {str(e)}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def bump(self, owner_id: int) -> None:
+        client = self._client()
+        if client is not None:
+            try:
+                client.incr(f"taskcounts:{owner_id}")
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        with _lock:
+            self._local[owner_id] = self._local.get(owner_id, 0) + 1
+
+    def get(self, owner_id: int) -> Hashable:
+        client = self._client()
+        if client is not None:
+            try:
+                return ("redis", int(client.get(f"taskcounts:{owner_id}") or 0))
+            except Exception as e:
+                self._redis_failed(e)
+        with _lock:
+            return ("local", self._local.get(owner_id, 0))
+
+
+generations = CountGenerations(redis_url(settings.TASK_COUNT_REDIS_URL))
+
+
+def invalidate_task_counts(owner_id: int) -> None:
+    """
+    Drop cached totals for `owner_id` after one of their tasks changed.
+    """
+    generations.bump(owner_id)
+
+
+def _estimate_rows(db: Session, statement: Select) -> Optional[int]:
+    """
+    The planner's row estimate for `statement` (PostgreSQL only).
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    sql = statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_tasks(db: Session, owner_id: int, filters: Hashable, statement: Select) -> Tuple[int, bool]:
+    """
+    Total rows matched by `statement` (a select of task ids), as
+    (total, is_exact). Counts exactly up to TASK_COUNT_EXACT_THRESHOLD and
+    stops there; larger totals use the planner estimate when available,
+    else the threshold. Results are cached per owner and filter set.
+    """
+    threshold = settings.TASK_COUNT_EXACT_THRESHOLD
+    key = (owner_id, generations.get(owner_id), filters)
+    with _lock:
+        cached = _cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+
+    # Never count past threshold + 1 rows
+    capped = select(func.count()).select_from(statement.limit(threshold + 1).subquery())
+    total = db.execute(capped).scalar()
+    is_exact = total <= threshold
+    if not is_exact:
+        estimate = _estimate_rows(db, statement)
+        total = max(estimate or 0, threshold)
+
+    with _lock:
+        _cache[key] = (time.monotonic() + settings.TASK_COUNT_CACHE_SECONDS, total, is_exact)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_COUNTS:
+            _cache.popitem(last=False)
+    return total, is_exact
@@ -0,0 +1,235 @@
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+import anyio
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.config import settings
+from app.db.bulk import Loader, batched
+from app.models.task import PRIORITY_RANK, TaskPriority, TaskStatus
+from app.models.task_import import ImportStatus
+from app.services.events import publish_task_event
+from app.services.reminders import schedule_reminders_for_new_tasks
+from app.services.task_counts import invalidate_task_counts
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+FORMATS = set(CONTENT_TYPES.values())
+
+# Task fields a row may set; anything else is ignored
+ROW_FIELDS = set(schemas.TaskCreate.model_fields)
+
+TASK_COLUMNS = (
+    "title", "description", "status", "priority", "priority_rank", "due_date",
+    "created_at", "updated_at", "project_id", "assigned_user_id", "owner_id",
+)
+
+
+ASSIGNEE = TASK_COLUMNS.index("assigned_user_id")
+
+
+class ImportTooLarge(Exception):
+    pass
+
+
+def format_from_content_type(content_type: str) -> Optional[str]:
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+def create_import(db: Session, owner_id: int, format: str) -> models.TaskImport:
+    """
+    Record a new import and pick the path its upload is spooled to. The
+    session is closed so no connection is held while the upload streams
+    in; the returned job is detached, and callers add it back to `db` to
+    record the outcome.
+    """
+    job = models.TaskImport(owner_id=owner_id, format=format, errors=[])
+    db.add(job)
+    db.flush()
+    job.file_path = os.path.join(settings.IMPORT_DIR or tempfile.gettempdir(), f"task-import-{job.id}.upload")
+    db.commit()
+    db.refresh(job)
+    db.close()
+    return job
+
+
+async def spool_upload(chunks: AsyncIterator[bytes], path: str, max_bytes: int) -> int:
+    """
+    Write a streamed request body to `path` chunk by chunk. Returns its size.
+    """
+    size = 0
+    try:
+        async with await anyio.open_file(path, "wb") as spool:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImportTooLarge(f"Upload exceeds {max_bytes} bytes")
+                await spool.write(chunk)
+    except BaseException:
+        remove_upload(path)
+        raise
+    return size
+
+
+def remove_upload(path: Optional[str]) -> None:
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def read_rows(stream: BinaryIO, format: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Yield (line number, row, parse error) for each record of the upload.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if format == "csv":
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, row, None
+            return
+        for line_number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line), None
+            except ValueError as e:
+                yield line_number, None, f"invalid JSON: {str(e)}"
+    finally:
+        # Leave `stream` open for the caller's progress reporting
+        text.detach()
+
+
+def parse_row(data: Any, owner_id: int, project_ids: Set[int], now: datetime) -> Tuple:
+    """
+    Validate one record and return it as a row of TASK_COLUMNS.
+    Raises ValueError or ValidationError for invalid records.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("expected an object")
+    # Empty CSV cells mean "not set"
+    values = {key: value for key, value in data.items() if key in ROW_FIELDS and value != ""}
+    task_in = schemas.TaskCreate.model_validate(values)
+    if task_in.project_id not in project_ids:
+        raise ValueError(f"project {task_in.project_id} not found")
+    priority = task_in.priority or TaskPriority.MEDIUM
+    due_date = task_in.due_date
+    if due_date is not None and due_date.tzinfo is not None:
+        due_date = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return (
+        task_in.title,
+        task_in.description,
+        (task_in.status or TaskStatus.TODO).value,
+        priority.value,
+        PRIORITY_RANK[priority],
+        due_date,
+        now,
+        now,
+        task_in.project_id,
+        task_in.assigned_user_id,
+        owner_id,
+    )
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+
+def run_import(db: Session, job: models.TaskImport) -> None:
+    """
+    Load a spooled upload into the task table in IMPORT_BATCH_SIZE batches
+    (COPY on PostgreSQL), each committed with the job's progress. Invalid
+    rows are skipped and reported. No per-task notifications are sent;
+    reminders for the imported tasks are scheduled in bulk at the end.
+    """
+    job.status = ImportStatus.RUNNING
+    db.commit()
+
+    project_ids = {
+        project_id
+        for (project_id,) in db.query(models.Project.id).filter(
+            models.Project.owner_id == job.owner_id,
+            models.Project.deleted_at.is_(None),
+        )
+    }
+    first_new_id = (db.query(func.max(models.Task.id)).scalar() or 0) + 1
+    errors: List[Dict[str, Any]] = list(job.errors or [])
+
+    def reject(line: Optional[int], message: str) -> None:
+        job.rows_failed += 1
+        if len(errors) < settings.IMPORT_MAX_ERRORS:
+            errors.append({"line": line, "error": message})
+
+    loader = Loader(db.get_bind())
+    try:
+        with open(job.file_path, "rb") as stream:
+            for batch in batched(read_rows(stream, job.format), settings.IMPORT_BATCH_SIZE):
+                now = datetime.utcnow()
+                rows: List[Tuple[int, Tuple]] = []
+                for line, data, error in batch:
+                    if error:
+                        reject(line, error)
+                        continue
+                    try:
+                        rows.append((line, parse_row(data, job.owner_id, project_ids, now)))
+                    except (ValueError, ValidationError) as e:
+                        reject(line, _describe(e))
+
+                # Unknown assignees would fail the whole batch on the foreign key
+                assignees = {row[ASSIGNEE] for _, row in rows if row[ASSIGNEE] is not None}
+                if assignees:
+                    known = {
+                        user_id
+                        for (user_id,) in db.query(models.User.id).filter(models.User.id.in_(assignees))
+                    }
+                    for line, row in rows:
+                        if row[ASSIGNEE] is not None and row[ASSIGNEE] not in known:
+                            reject(line, f"assigned user {row[ASSIGNEE]} not found")
+                    rows = [(line, row) for line, row in rows if row[ASSIGNEE] is None or row[ASSIGNEE] in known]
+
+                if rows:
+                    loader.load("task", TASK_COLUMNS, (row for _, row in rows), len(rows))
+                job.rows_imported += len(rows)
+                job.bytes_processed = stream.tell()
+                job.errors = list(errors)
+                db.commit()
+
+        schedule_reminders_for_new_tasks(db, job.owner_id, first_new_id, settings.IMPORT_BATCH_SIZE)
+        job.status = ImportStatus.DONE
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Task import {job.id} failed: {str(e)}")
+        job.status = ImportStatus.FAILED
+        reject(None, f"import aborted: {str(e)}")
+    finally:
+        loader.close()
+        job.errors = list(errors)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        remove_upload(job.file_path)
+
+    logger.info(f"Task import {job.id}: {job.rows_imported} imported, {job.rows_failed} failed")
+    if job.rows_imported:
+        invalidate_task_counts(job.owner_id)
+        publish_task_event(
+            "task.imported",
+            job.owner_id,
+            {"import_id": job.id, "rows_imported": job.rows_imported},
+        )
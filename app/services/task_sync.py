@@ -0,0 +1,118 @@
+import base64
+import binascii
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+class SyncTokenExpired(Exception):
+    """
+    The token predates the tombstone retention window, so deletions may
+    have been missed; the client has to start over with a full sync.
+    """
+
+
+def encode_token(seq: int, issued_at: Optional[float] = None) -> str:
+    """
+    Opaque sync token: the last change sequence number the client has
+    seen and when the token was issued.
+    """
+    issued_at = int(time.time() if issued_at is None else issued_at)
+    return base64.urlsafe_b64encode(f"{seq}:{issued_at}".encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Tuple[int, int]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        seq, issued_at = (int(part) for part in raw.split(":"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidSyncToken("Invalid sync token")
+    if seq < 0:
+        raise InvalidSyncToken("Invalid sync token")
+    return seq, issued_at
+
+
+def read_changes(
+    db: Session, owner_id: int, criteria: List[Any], since: Optional[str], limit: int,
+) -> Dict[str, Any]:
+    """
+    Up to `limit` of `owner_id`'s task changes after the `since` token, in
+    change order: current versions of tasks created or updated since, and
+    tombstones of tasks deleted since. Without `since`, every visible task
+    (a full sync, no tombstones). `criteria` restrict the tasks returned.
+
+    Both lookups are range scans of an (owner_id, change_seq) index.
+    Sequence numbers are assigned under a per-owner row lock held until
+    commit, so a change can't become visible behind the returned token.
+    """
+    if since is None:
+        seq = 0
+    else:
+        seq, issued_at = decode_token(since)
+        if time.time() - issued_at > settings.SYNC_TOMBSTONE_DAYS * 24 * 60 * 60:
+            raise SyncTokenExpired("Sync token expired; start over with a full sync")
+
+    tasks = (
+        db.query(models.Task)
+        .filter(*criteria, models.Task.change_seq > seq)
+        .order_by(models.Task.change_seq)
+        .limit(limit + 1)
+        .all()
+    )
+    tombstones: List[models.TaskTombstone] = []
+    if since is not None:
+        tombstones = (
+            db.query(models.TaskTombstone)
+            .filter(models.TaskTombstone.owner_id == owner_id, models.TaskTombstone.change_seq > seq)
+            .order_by(models.TaskTombstone.change_seq)
+            .limit(limit + 1)
+            .all()
+        )
+
+    # Merge by sequence number and cut at `limit`; the token points at the
+    # last change returned
+    changes = sorted(tasks + tombstones, key=lambda change: change.change_seq)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        seq = changes[-1].change_seq
+    return {
+        "tasks": [change for change in changes if isinstance(change, models.Task)],
+        "deleted": [change for change in changes if isinstance(change, models.TaskTombstone)],
+        "next_token": encode_token(seq),
+        "has_more": has_more,
+    }
+
+
+def prune_tombstones(db: Session, batch_size: int) -> int:
+    """
+    Delete tombstones older than SYNC_TOMBSTONE_DAYS, `batch_size` rows
+    per transaction. Returns the number deleted.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+    deleted = 0
+    while True:
+        ids = [
+            row.id
+            for row in db.query(models.TaskTombstone.id)
+            .filter(models.TaskTombstone.deleted_at < cutoff)
+            .limit(batch_size)
+            .all()
+        ]
+        if not ids:
+            break
+        db.query(models.TaskTombstone).filter(models.TaskTombstone.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            break
+    return deleted
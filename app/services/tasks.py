@@ -1,42 +1,36 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 import logging
 
 from celery import shared_task
-from sqlalchemy.orm import Session
 
 from app import models
-from app.db.session import SessionLocal
+from app.core.config import settings
+from app.db.session import session_scope
 from app.services.email import (
-    send_overdue_tasks_summary_email,
+    render_overdue_tasks_summary,
     send_task_assigned_email,
+    send_task_reminder_email,
     send_task_status_changed_email,
 )
+from app.services.archive import archive_tasks_batch, task_table_sizes
 from app.services.celery_utils import safe_task
+from app.services.mailer import OutgoingEmail, deliver_emails
+from app.services.reminders import pop_due_reminders
+from app.services.task_counts import invalidate_task_counts
+from app.services.task_import import run_import
+from app.services.task_sync import prune_tombstones
 
 logger = logging.getLogger(__name__)
 
 
-def get_db_session() -> Session:
-    """
-    Get a database session for Celery tasks.
-    """
-    db = SessionLocal()
-    try:
-        return db
-    except Exception as e:
-        db.close()
-        raise e
-
-
 @shared_task
 @safe_task
 def notify_task_assigned(task_id: int) -> None:
     """
     Send an email notification when a task is assigned to a user.
     """
-    db = get_db_session()
-    try:
+    with session_scope() as db:
         # Get task with related project and assigned user
         task = (
             db.query(models.Task)
@@ -65,8 +59,6 @@ def notify_task_assigned(task_id: int) -> None:
             project_name=task.project.name,
             due_date=due_date_str,
         )
-    finally:
-        db.close()
 
 
 @shared_task
@@ -75,8 +67,7 @@ def notify_task_status_changed(task_id: int, old_status: str, new_status: str) -
     """
     Send an email notification when a task's status changes.
     """
-    db = get_db_session()
-    try:
+    with session_scope() as db:
         # Get task with related project and assigned user
         task = (
             db.query(models.Task)
@@ -101,22 +92,75 @@ def notify_task_status_changed(task_id: int, old_status: str, new_status: str) -
             new_status=new_status,
             project_name=task.project.name,
         )
-    finally:
-        db.close()
 
 
 @shared_task
 @safe_task
-def send_daily_overdue_tasks_summary() -> None:
+def notify_task_reminder(task_id: int, kind: str) -> None:
     """
-    Send a daily summary email of overdue tasks to each user.
+    Send a "due soon" or "now overdue" reminder for a task.
     """
-    db = get_db_session()
-    try:
+    with session_scope() as db:
+        task = (
+            db.query(models.Task)
+            .join(models.Project)
+            .filter(models.Task.id == task_id, models.Project.deleted_at.is_(None))
+            .first()
+        )
+        # Reminders are rescheduled on every due date/status change, but the
+        # task may have been completed since this one was dispatched
+        if not task or not task.assigned_user_id or not task.due_date or task.status == "DONE":
+            return
+
+        user = db.query(models.User).filter(models.User.id == task.assigned_user_id).first()
+        if not user or not user.email:
+            return
+
+        send_task_reminder_email(
+            email_to=user.email,
+            task_title=task.title,
+            project_name=task.project.name,
+            due_date=task.due_date.strftime("%Y-%m-%d %H:%M"),
+            overdue=kind == "OVERDUE",
+        )
+
+
+@shared_task
+@safe_task
+def dispatch_due_reminders() -> None:
+    """
+    Enqueue notifications for reminders that are due. Reads only the due
+    rows off the fire_at index, so the cost follows the number of
+    reminders firing rather than the number of tasks.
+    """
+    with session_scope() as db:
+        now = datetime.utcnow()
+        dispatched = 0
+        while True:
+            # A failed enqueue raises here; its reminder is kept for the next poll
+            sent = pop_due_reminders(db, now, settings.REMINDER_BATCH_SIZE, notify_task_reminder.delay)
+            dispatched += sent
+            if sent < settings.REMINDER_BATCH_SIZE:
+                break
+        if dispatched:
+            logger.info(f"Dispatched {dispatched} task reminders")
+
+
+@shared_task
+@safe_task
+def send_daily_overdue_tasks_summary() -> Optional[Dict[str, Any]]:
+    """
+    Send a daily summary email of overdue tasks to each user. The emails
+    are sent concurrently once all summaries are built; returns the
+    delivery stats.
+    """
+    # Read-only reporting query; a replica is fine
+    with session_scope(read_only=True) as db:
         # Get all active users
         users = db.query(models.User).filter(models.User.is_active == True).all()
         
         today = datetime.utcnow().date()
+        emails: List[OutgoingEmail] = []
         
         for user in users:
             if not user.email:
@@ -130,6 +174,7 @@ def send_daily_overdue_tasks_summary() -> None:
                     models.Task.assigned_user_id == user.id,
                     models.Task.due_date < today,
                     models.Task.status != "DONE",
+                    models.Project.deleted_at.is_(None),
                 )
                 .all()
             )
@@ -147,10 +192,116 @@ def send_daily_overdue_tasks_summary() -> None:
                     "priority": task.priority,
                 })
             
-            # Send email
-            send_overdue_tasks_summary_email(
-                email_to=user.email,
-                overdue_tasks=tasks_data,
+            subject, html = render_overdue_tasks_summary(tasks_data)
+            emails.append(OutgoingEmail(email_to=user.email, subject=subject, html=html))
+
+    if not emails:
+        return None
+    return deliver_emails(emails).summary()
+
+@shared_task
+@safe_task
+def delete_project_in_batches(project_id: int) -> None:
+    """
+    Delete a hidden project's tasks in bounded batches, then the project.
+    Each batch is its own short transaction so locks are held briefly.
+    """
+    batch_size = settings.PROJECT_DELETE_BATCH_SIZE
+    with session_scope() as db:
+        project = db.query(models.Project.owner_id).filter(models.Project.id == project_id).first()
+        if project is None:
+            return
+        deleted = 0
+        while True:
+            task_ids = [
+                row.id
+                for row in db.query(models.Task.id)
+                .filter(models.Task.project_id == project_id)
+                .limit(batch_size)
+                .all()
+            ]
+            if not task_ids:
+                break
+            db.query(models.Task).filter(models.Task.id.in_(task_ids)).delete(
+                synchronize_session=False
             )
-    finally:
-        db.close()
\ No newline at end of file
+            db.commit()
+            deleted += len(task_ids)
+
+        db.query(models.Project).filter(models.Project.id == project_id).delete(
+            synchronize_session=False
+        )
+        db.commit()
+        invalidate_task_counts(project.owner_id)
+        logger.info(f"Deleted project {project_id} and {deleted} tasks")
+
+
+@shared_task
+@safe_task
+def requeue_deleted_projects() -> int:
+    """
+    Queue delete_project_in_batches again for projects hidden more than
+    PROJECT_DELETE_RETRY_MINUTES ago, whose deletion job never ran or
+    didn't finish. Deleting is idempotent, so a slow job running twice is
+    harmless.
+    """
+    cutoff = datetime.utcnow() - timedelta(minutes=settings.PROJECT_DELETE_RETRY_MINUTES)
+    with session_scope() as db:
+        project_ids = [
+            row.id
+            for row in db.query(models.Project.id).filter(models.Project.deleted_at < cutoff).all()
+        ]
+    for project_id in project_ids:
+        delete_project_in_batches.delay(project_id)
+    if project_ids:
+        logger.warning(f"Re-queued deletion of {len(project_ids)} hidden projects")
+    return len(project_ids)
+
+
+@shared_task
+@safe_task
+def archive_done_tasks() -> Dict[str, Any]:
+    """
+    Move DONE tasks older than ARCHIVE_DONE_AFTER_DAYS into the archive
+    table in small batches, each its own transaction so locks stay short.
+    Returns the rows moved and the table/index sizes before and after.
+    """
+    with session_scope() as db:
+        cutoff = datetime.utcnow() - timedelta(days=settings.ARCHIVE_DONE_AFTER_DAYS)
+        sizes_before = task_table_sizes(db)
+        moved = 0
+        while True:
+            batch = archive_tasks_batch(db, cutoff, settings.ARCHIVE_BATCH_SIZE)
+            moved += batch
+            if batch < settings.ARCHIVE_BATCH_SIZE:
+                break
+        sizes_after = task_table_sizes(db)
+        # Freed space is reused by new rows; VACUUM (autovacuum) makes it available
+        logger.info(f"Archived {moved} tasks; sizes before {sizes_before}, after {sizes_after}")
+        return {"moved": moved, "sizes_before": sizes_before, "sizes_after": sizes_after}
+
+
+@shared_task
+@safe_task
+def prune_task_tombstones() -> int:
+    """
+    Drop delta sync tombstones past SYNC_TOMBSTONE_DAYS.
+    """
+    with session_scope() as db:
+        deleted = prune_tombstones(db, settings.SYNC_PRUNE_BATCH_SIZE)
+        logger.info(f"Pruned {deleted} task tombstones")
+        return deleted
+
+
+# Large imports can run well past the default 30 minute limit
+@shared_task(soft_time_limit=6 * 60 * 60, time_limit=6 * 60 * 60 + 60)
+@safe_task
+def import_tasks(import_id: int) -> None:
+    """
+    Load a spooled bulk task import (see app/services/task_import.py).
+    """
+    with session_scope() as db:
+        job = db.query(models.TaskImport).filter(models.TaskImport.id == import_id).first()
+        if not job or job.status != models.ImportStatus.PENDING:
+            return
+        run_import(db, job)
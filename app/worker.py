@@ -1,17 +1,17 @@
+import logging
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create Celery instance
 celery_app = Celery(
     "task_management",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=[
-        "app.services.tasks.notify_task_assigned",
-        "app.services.tasks.notify_task_status_changed",
-        "app.services.tasks.send_daily_overdue_tasks_summary",
-    ]
+    include=["app.services.tasks"]
 )
 
 # Celery configuration
@@ -28,6 +28,34 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
+# Periodic jobs (run `celery -A app.worker beat` alongside the workers)
+celery_app.conf.beat_schedule = {
+    "dispatch-due-reminders": {
+        "task": "app.services.tasks.dispatch_due_reminders",
+        "schedule": float(settings.REMINDER_POLL_SECONDS),
+    },
+    "archive-done-tasks": {
+        "task": "app.services.tasks.archive_done_tasks",
+        "schedule": 24 * 60 * 60.0,
+    },
+    "prune-task-tombstones": {
+        "task": "app.services.tasks.prune_task_tombstones",
+        "schedule": 24 * 60 * 60.0,
+    },
+    "requeue-deleted-projects": {
+        "task": "app.services.tasks.requeue_deleted_projects",
+        "schedule": 60 * 60.0,
+    },
+}
+
+# Trace task publishing and execution (also loaded by the API process,
+# which publishes the tasks)
+if settings.TRACING_ENABLED:
+    from app.core.tracing import configure_tracing, instrument_celery
+
+    configure_tracing("worker")
+    instrument_celery()
+
 # Task routing
 celery_app.conf.task_routes = {
     "app.services.tasks.*": {"queue": "celery"},
@@ -35,6 +63,31 @@ celery_app.conf.task_routes = {
 
 # Error handling and fallback
 if not settings.CELERY_BROKER_URL or "redis" not in settings.CELERY_BROKER_URL:
-    # Fallback to eager mode if Redis is not available
+    # Without Redis the API runs jobs on its in-process queue (see
+    # app/services/background.py); eager mode only covers tasks queued
+    # from inside those jobs
     celery_app.conf.task_always_eager = True
-    celery_app.conf.task_eager_propagates = True
\ No newline at end of file
+    celery_app.conf.task_eager_propagates = True
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """
+    Runs in each prefork child before its first task: replace the pools
+    inherited from the parent and open a connection up front.
+    """
+    from app.db.session import prewarm_pool, reset_engines_after_fork
+
+    reset_engines_after_fork(settings.WORKER_DB_POOL_SIZE, settings.WORKER_DB_MAX_OVERFLOW)
+    if settings.WORKER_DB_POOL_PREWARM > 0:
+        try:
+            prewarm_pool(settings.WORKER_DB_POOL_PREWARM)
+        except Exception as e:
+            logger.warning(f"Could not pre-warm worker database pool: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    from app.db.session import dispose_engines
+
+    dispose_engines()
@@ -0,0 +1,50 @@
+"""
+Compare two load-test reports produced by `benchmarks.loadtest`.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+import argparse
+import json
+
+METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def change(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"baseline:  {baseline.get('commit')}  {baseline.get('timestamp')}")
+    print(f"candidate: {candidate.get('commit')}  {candidate.get('timestamp')}")
+    if baseline.get("config") != candidate.get("config"):
+        print("warning: runs used different configurations")
+
+    print(f"{'endpoint':<22}" + "".join(f"{metric:>26}" for metric in METRICS))
+    for name in sorted(set(baseline["endpoints"]) | set(candidate["endpoints"])):
+        old = baseline["endpoints"].get(name)
+        new = candidate["endpoints"].get(name)
+        if not old or not new:
+            print(f"{name:<22}  only in {'candidate' if new else 'baseline'}")
+            continue
+        cells = [
+            f"{old[metric]:.1f} -> {new[metric]:.1f} ({change(old[metric], new[metric])})"
+            for metric in METRICS
+        ]
+        print(f"{name:<22}" + "".join(f"{cell:>26}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+CPU time and compressed size per encoder for task-list-like JSON payloads.
+
+Usage:
+    python -m benchmarks.compression --sizes 1 10 100 1000 --repeat 20
+
+Sizes are numbers of tasks in the payload. Install `brotli` and/or
+`zstandard` to include those encoders.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.core.compression import available_encoders
+
+
+def task_payload(count: int) -> bytes:
+    now = datetime(2026, 1, 1)
+    return json.dumps([
+        {
+            "title": f"Task {i}: follow up with the customer about the invoice",
+            "description": "Check the numbers against last quarter and reply." if i % 3 else None,
+            "status": ["TODO", "IN_PROGRESS", "DONE"][i % 3],
+            "priority": ["LOW", "MEDIUM", "HIGH"][i % 3],
+            "due_date": (now + timedelta(days=i % 40)).isoformat(),
+            "project_id": 1 + i % 7,
+            "assigned_user_id": 1 + i % 13,
+            "id": i + 1,
+            "created_at": now.isoformat(),
+            "updated_at": (now + timedelta(hours=i)).isoformat(),
+        }
+        for i in range(count)
+    ]).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    encoders = available_encoders()
+    print(f"{'tasks':>7}{'raw bytes':>12}{'encoder':>9}{'bytes':>11}{'ratio':>8}{'ms/op':>9}{'MB/s':>9}")
+    for count in args.sizes:
+        body = task_payload(count)
+        for name, encoder in encoders.items():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                compressed = encoder(body)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            print(
+                f"{count:>7}{len(body):>12}{name:>9}{len(compressed):>11}"
+                f"{len(body) / len(compressed):>8.1f}{elapsed * 1000:>9.2f}"
+                f"{len(body) / elapsed / 1e6:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Latency and errors per request class while the database slows down, with
+and without the adaptive concurrency limiter. A stand-in app models the
+API: sync endpoints in the AnyIO threadpool, each holding one of 30 pooled
+"connections" (a semaphore, 30 s checkout timeout like SQLAlchemy's) per
+query. Queries take --query-ms, and ten times that during the slow phase.
+An open-loop client sends --rate requests per second: 10% /health,
+60% task detail (one query) and 30% task list (three queries).
+
+Usage:
+    python -m benchmarks.concurrency [--rate 200] [--phase-seconds 4]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.core.concurrency import AdaptiveLimiter, ConcurrencyLimitMiddleware
+
+POOL_SIZE = 30
+MIX = (("health", "/health", 0.1), ("detail", "/api/tasks/1", 0.6), ("list", "/api/tasks/", 0.3))
+PHASES = ("normal", "slow", "recovered")
+
+
+class Database:
+    def __init__(self, query_ms: float) -> None:
+        self.pool = threading.BoundedSemaphore(POOL_SIZE)
+        self.query_seconds = query_ms / 1000
+        self.slowdown = 1
+
+    def query(self, count: int = 1) -> None:
+        if not self.pool.acquire(timeout=30):
+            raise HTTPException(status_code=500, detail="pool timeout")
+        try:
+            time.sleep(self.query_seconds * self.slowdown * count)
+        finally:
+            self.pool.release()
+
+
+def build_app(database: Database, limited: bool) -> FastAPI:
+    app = FastAPI()
+    if limited:
+        limiter = AdaptiveLimiter(
+            initial_limit=20, min_limit=4, max_limit=POOL_SIZE, max_queue=100, queue_timeout=1.0, tolerance=2.0,
+        )
+        app.add_middleware(
+            ConcurrencyLimitMiddleware, limiter=limiter, low_priority_paths=("/api/tasks",),
+        )
+        app.state.limiter = limiter
+
+    @app.get("/health")
+    def health():
+        database.query()
+        return {"status": "healthy"}
+
+    @app.get("/api/tasks/{task_id}")
+    def read_task(task_id: int):
+        database.query()
+        return {"id": task_id}
+
+    @app.get("/api/tasks/")
+    def read_tasks():
+        database.query(3)
+        return []
+
+    return app
+
+
+async def drive(app: FastAPI, database: Database, rate: float, phase_seconds: float) -> Dict[Tuple[str, str], List]:
+    results: Dict[Tuple[str, str], List] = defaultdict(list)
+    rng = random.Random(1)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+
+        async def one(phase: str, name: str, path: str) -> None:
+            started = time.perf_counter()
+            try:
+                status = (await client.get(path)).status_code
+            except Exception:
+                status = 599
+            results[(phase, name)].append((time.perf_counter() - started, status))
+
+        pending = []
+        for phase in PHASES:
+            database.slowdown = 10 if phase == "slow" else 1
+            phase_end = time.perf_counter() + phase_seconds
+            while time.perf_counter() < phase_end:
+                name, path = rng.choices([(n, p) for n, p, _ in MIX], [w for _, _, w in MIX])[0]
+                pending.append(asyncio.create_task(one(phase, name, path)))
+                await asyncio.sleep(rng.expovariate(rate))
+        await asyncio.gather(*pending)
+    return results
+
+
+def report(title: str, results: Dict[Tuple[str, str], List]) -> None:
+    print(f"\n{title}")
+    print(f"{'phase':<10} {'request':<8} {'count':>6} {'p50 ms':>8} {'p99 ms':>9} {'503':>5} {'5xx':>5}")
+    for phase in PHASES:
+        for name, _, _ in MIX:
+            samples = results.get((phase, name), [])
+            if not samples:
+                continue
+            latencies = sorted(latency for latency, _ in samples)
+            shed = sum(1 for _, status in samples if status == 503)
+            errors = sum(1 for _, status in samples if status >= 500 and status != 503)
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(
+                f"{phase:<10} {name:<8} {len(samples):>6} {statistics.median(latencies) * 1000:>8.0f} "
+                f"{p99 * 1000:>9.0f} {shed:>5} {errors:>5}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=200, help="Requests per second")
+    parser.add_argument("--phase-seconds", type=float, default=4)
+    parser.add_argument("--query-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    for limited in (False, True):
+        database = Database(args.query_ms)
+        app = build_app(database, limited)
+        results = asyncio.run(drive(app, database, args.rate, args.phase_seconds))
+        report("adaptive limiter" if limited else "no limiter", results)
+        if limited:
+            print(f"final limiter state: {app.state.limiter.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Bulk email delivery against a local SMTP sink with simulated network
+latency: one connection per message sent in turn (the old behaviour)
+versus the concurrent, connection-reusing delivery engine.
+
+Usage:
+    python -m benchmarks.email_delivery --messages 500 --latency-ms 20 \
+        [--concurrency 10] [--per-connection 100] [--fail-rate 0.05]
+"""
+import argparse
+import asyncio
+import json
+import random
+
+from app.services.mailer import OutgoingEmail, SMTPDelivery
+
+
+class SMTPSink:
+    """
+    Minimal SMTP server that accepts and discards mail, sleeping
+    `latency` seconds before each reply. With `fail_rate`, that share of
+    messages is rejected with a transient 451 after DATA.
+    """
+
+    def __init__(self, latency: float, fail_rate: float = 0.0) -> None:
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.received = 0
+        self.connections = 0
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: bytes) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(line + b"\r\n")
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await self._reply(writer, b"220 sink ESMTP")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                command = line[:4].upper()
+                if command == b"EHLO":
+                    await self._reply(writer, b"250-sink\r\n250-8BITMIME\r\n250 SIZE 10485760")
+                elif command in (b"HELO", b"MAIL", b"RCPT", b"RSET", b"NOOP"):
+                    await self._reply(writer, b"250 OK")
+                elif command == b"DATA":
+                    await self._reply(writer, b"354 End data with <CR><LF>.<CR><LF>")
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    if random.random() < self.fail_rate:
+                        await self._reply(writer, b"451 Try again later")
+                    else:
+                        self.received += 1
+                        await self._reply(writer, b"250 Queued")
+                elif command == b"QUIT":
+                    await self._reply(writer, b"221 Bye")
+                    return
+                else:
+                    await self._reply(writer, b"502 Not implemented")
+        finally:
+            writer.close()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    emails = [
+        OutgoingEmail(
+            email_to=f"user{i}@example.com",
+            subject="Daily Summary: Overdue Tasks",
+            html="<p>You have the following overdue tasks:</p>" + "<tr><td>Task</td></tr>" * 20,
+        )
+        for i in range(args.messages)
+    ]
+    results = {}
+    for name, concurrency, per_connection in (
+        ("sequential", 1, 1),
+        ("concurrent", args.concurrency, args.per_connection),
+    ):
+        sink = SMTPSink(args.latency_ms / 1000, args.fail_rate)
+        server = await asyncio.start_server(sink.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        delivery = SMTPDelivery(
+            hostname="127.0.0.1",
+            port=port,
+            from_address="Tasks <tasks@example.com>",
+            concurrency=concurrency,
+            messages_per_connection=per_connection,
+            backoff_seconds=0.05,
+        )
+        async with server:
+            stats = await delivery.deliver(emails)
+        results[name] = {**stats.summary(), "received_by_sink": sink.received}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Delay before every SMTP reply")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--per-connection", type=int, default=100)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of messages rejected with 451")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+Load-test benchmark for the API.
+
+Starts the app with uvicorn against the given database, seeds users, projects
+and tasks, then drives a weighted mix of requests at a fixed concurrency and
+records latency percentiles and throughput per endpoint to a JSON file.
+
+Usage:
+    python -m benchmarks.loadtest --database-url sqlite:///./benchmark_load.db \\
+        --users 20 --projects-per-user 5 --tasks-per-project 200 \\
+        --concurrency 16 --duration 30 --output benchmark_load.json
+
+Compare two runs with `python -m benchmarks.compare old.json new.json`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.seed import SEED_PASSWORD, seed, user_email
+
+# name -> relative weight; the mix roughly follows production traffic
+DEFAULT_MIX = {
+    "login": 1,
+    "list_tasks": 10,
+    "list_tasks_filtered": 8,
+    "list_tasks_sorted": 6,
+    "list_tasks_deep_page": 3,
+    "read_project": 5,
+    "create_task": 3,
+    "update_task": 4,
+}
+
+
+class Recorder:
+    """
+    Collects per-endpoint latencies and error counts.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, name: str, elapsed: float, ok: bool) -> None:
+        self.latencies.setdefault(name, []).append(elapsed)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for name, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            result[name] = {
+                "requests": len(samples),
+                "errors": self.errors.get(name, 0),
+                "throughput_rps": len(samples) / duration,
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "max_ms": samples[-1] * 1000,
+            }
+        return result
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class Session:
+    """
+    One simulated client: a logged-in user with the ids it can act on.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, user_index: int) -> None:
+        self.client = client
+        self.user_index = user_index
+        self.headers: Dict[str, str] = {}
+        self.project_ids: List[int] = []
+        self.task_ids: List[int] = []
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/auth/login",
+            data={"username": user_email(self.user_index), "password": SEED_PASSWORD},
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def prepare(self) -> None:
+        await self.login()
+        projects = await self.client.get("/api/projects/", headers=self.headers)
+        self.project_ids = [p["id"] for p in projects.json()]
+        tasks = await self.client.get("/api/tasks/", params={"limit": 100}, headers=self.headers)
+        self.task_ids = [t["id"] for t in tasks.json()]
+
+
+async def run_operation(name: str, session: Session, rng: random.Random, max_page: int) -> httpx.Response:
+    client, headers = session.client, session.headers
+    if name == "login":
+        return await session.login()
+    if name == "list_tasks":
+        return await client.get("/api/tasks/", headers=headers)
+    if name == "list_tasks_filtered":
+        params = {"status": rng.choice(["TODO", "IN_PROGRESS", "DONE"])}
+        if rng.random() < 0.5:
+            params["priority"] = rng.choice(["LOW", "MEDIUM", "HIGH"])
+        if session.project_ids and rng.random() < 0.5:
+            params["project_id"] = rng.choice(session.project_ids)
+        return await client.get("/api/tasks/", params=params, headers=headers)
+    if name == "list_tasks_sorted":
+        params = {
+            "sort": rng.choice(["priority", "due_date"]),
+            "sort_order": rng.choice(["asc", "desc"]),
+            "limit": 50,
+        }
+        return await client.get("/api/tasks/", params=params, headers=headers)
+    if name == "list_tasks_deep_page":
+        params = {"page": rng.randint(max(1, max_page // 2), max_page), "limit": 10, "sort": "due_date"}
+        return await client.get("/api/tasks/", params=params, headers=headers)
+    if name == "read_project":
+        return await client.get(f"/api/projects/{rng.choice(session.project_ids)}", headers=headers)
+    if name == "create_task":
+        response = await client.post(
+            "/api/tasks/",
+            json={
+                "title": f"Load test task {rng.randint(0, 10**9)}",
+                "project_id": rng.choice(session.project_ids),
+                "priority": rng.choice(["LOW", "MEDIUM", "HIGH"]),
+            },
+            headers=headers,
+        )
+        if response.status_code == 200:
+            session.task_ids.append(response.json()["id"])
+        return response
+    if name == "update_task":
+        return await client.patch(
+            f"/api/tasks/{rng.choice(session.task_ids)}",
+            json={"status": rng.choice(["TODO", "IN_PROGRESS", "DONE"])},
+            headers=headers,
+        )
+    raise ValueError(f"Unknown operation: {name}")
+
+
+async def drive(
+    base_url: str,
+    users: int,
+    concurrency: int,
+    duration: float,
+    mix: Dict[str, int],
+    max_page: int,
+    seed: int,
+) -> Dict[str, Any]:
+    recorder = Recorder()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        sessions = [Session(client, i % users) for i in range(concurrency)]
+        await asyncio.gather(*(session.prepare() for session in sessions))
+        deadline = time.perf_counter() + duration
+
+        async def worker(worker_id: int, session: Session) -> None:
+            rng = random.Random(seed * 1000 + worker_id)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                if name == "update_task" and not session.task_ids:
+                    name = "create_task"
+                start = time.perf_counter()
+                try:
+                    response = await run_operation(name, session, rng, max_page)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                recorder.record(name, time.perf_counter() - start, ok)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i, s) for i, s in enumerate(sessions)))
+        elapsed = time.perf_counter() - started
+
+    endpoints = recorder.summary(elapsed)
+    total = sum(stats["requests"] for stats in endpoints.values())
+    return {
+        "duration_s": elapsed,
+        "total_requests": total,
+        "total_throughput_rps": total / elapsed,
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def database_is_empty(database_url: str) -> bool:
+    from sqlalchemy import create_engine, inspect, text
+
+    engine = create_engine(database_url)
+    try:
+        if not inspect(engine).has_table("user"):
+            return True
+        with engine.connect() as conn:
+            return conn.execute(text('SELECT COUNT(*) FROM "user"')).scalar() == 0
+    finally:
+        engine.dispose()
+
+
+def wait_for_server(base_url: str, timeout: float = 30) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server at {base_url} did not start within {timeout}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./benchmark_load.db")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--projects-per-user", type=int, default=5)
+    parser.add_argument("--tasks-per-project", type=int, default=100)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded database")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to drive load for")
+    parser.add_argument("--mix", help='JSON object overriding operation weights, e.g. \'{"login": 0}\'')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--base-url", help="Benchmark an already running server instead of starting one")
+    parser.add_argument("--output", default="benchmark_load.json")
+    args = parser.parse_args()
+
+    # Must be set before any app module reads the settings
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+    os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+    # A handful of simulated users would otherwise trip the per-user limits
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    seeded = None
+    if not args.skip_seed:
+        started = time.perf_counter()
+        if not database_is_empty(args.database_url):
+            raise SystemExit("Database is not empty; use a fresh database or --skip-seed")
+        # Uniform tasks per project so every run sees the same page depths
+        seeded = seed(
+            args.database_url,
+            users=args.users,
+            projects_per_user=args.projects_per_user,
+            tasks_per_project=args.tasks_per_project,
+            seed=args.seed,
+            skew=0,
+        )
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix.update(json.loads(args.mix))
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+
+    # Deep pages land somewhere in the second half of a user's task list
+    tasks_per_user = args.projects_per_user * args.tasks_per_project
+    max_page = max(1, tasks_per_user // 10)
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(args.port),
+                "--workers", str(args.workers), "--log-level", "warning",
+            ],
+            env=dict(os.environ),
+        )
+    try:
+        wait_for_server(base_url)
+        results = asyncio.run(
+            drive(base_url, args.users, args.concurrency, args.duration, mix, max_page, args.seed)
+        )
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "database": args.database_url.split(":", 1)[0],
+        "config": {
+            "users": args.users,
+            "projects_per_user": args.projects_per_user,
+            "tasks_per_project": args.tasks_per_project,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "seed": args.seed,
+            "mix": mix,
+        },
+        "seeded": seeded,
+        **results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'endpoint':<22}{'req':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, stats in report["endpoints"].items():
+        print(
+            f"{name:<22}{stats['requests']:>8}{stats['errors']:>6}{stats['throughput_rps']:>9.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+        )
+    print(f"Total: {report['total_requests']} requests, {report['total_throughput_rps']:.1f} req/s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Per-check overhead of the rate limiter, in-process and (optionally) Redis.
+
+Usage:
+    python -m benchmarks.rate_limit --checks 20000 [--redis-url redis://localhost:6379/0]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.rate_limit import RateLimiter
+
+
+async def measure(limiter: RateLimiter, checks: int, keys: int) -> list:
+    samples = []
+    for i in range(checks):
+        start = time.perf_counter()
+        await limiter.hit(f"bench:user:{i % keys}", "1000000/1")
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)
+
+
+def report(name: str, samples: list) -> None:
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(
+        f"{name:>10}: median {statistics.median(samples) * 1e6:7.1f} us  "
+        f"p99 {p99 * 1e6:7.1f} us  ({len(samples)} checks)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=1000, help="Distinct users to spread checks over")
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    report("local", asyncio.run(measure(RateLimiter(None), args.checks, args.keys)))
+    if args.redis_url:
+        report("redis", asyncio.run(measure(RateLimiter(args.redis_url), args.checks, args.keys)))
+
+
+if __name__ == "__main__":
+    main()
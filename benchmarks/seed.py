@@ -0,0 +1,218 @@
+"""
+Synthetic data seeder for scale testing.
+
+Generates users, projects and tasks with realistic distributions (skewed
+tasks per project, mixed statuses and priorities, a share of overdue tasks)
+and streams them into the database in batches: `COPY ... FROM STDIN` on
+PostgreSQL, `executemany` on SQLite and anything else. Output is
+deterministic for a given `--seed` and `--reference-time` (midnight UTC
+today by default, so overdue tasks stay overdue) on an empty database.
+
+Usage:
+    python -m benchmarks.seed --database-url postgresql://... \\
+        --users 10000 --projects-per-user 5 --tasks-per-project 40 --seed 1
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, func, select
+
+from app.db.bulk import Loader
+from app.models.task import PRIORITY_RANK
+
+SEED_PASSWORD = "benchmark-password"
+
+USER_COLUMNS = ("id", "email", "hashed_password", "full_name", "is_active", "is_superuser")
+PROJECT_COLUMNS = ("id", "name", "description", "owner_id")
+TASK_COLUMNS = (
+    "id", "title", "description", "status", "priority", "priority_rank", "due_date",
+    "created_at", "updated_at", "project_id", "assigned_user_id", "owner_id",
+)
+
+STATUS_WEIGHTS = {"TODO": 40, "IN_PROGRESS": 25, "DONE": 35}
+PRIORITY_WEIGHTS = {"LOW": 30, "MEDIUM": 50, "HIGH": 20}
+
+
+def user_email(index: int) -> str:
+    return f"bench-user-{index}@example.com"
+
+
+def tasks_for_project(rng: random.Random, mean: float, skew: float) -> int:
+    """
+    Number of tasks for one project. With `skew` > 1 this is Pareto
+    distributed around the given mean (smaller skew = heavier tail), capped
+    at 100x the mean; 0 gives every project exactly `mean` tasks.
+    """
+    if skew <= 1:
+        return int(mean)
+    # Pareto(alpha) with x_m = 1 has mean alpha / (alpha - 1)
+    return int(min(mean * rng.paretovariate(skew) * (skew - 1) / skew, mean * 100))
+
+
+def generate_users(first_id: int, count: int, hashed_password: str) -> Iterator[Tuple]:
+    for offset in range(count):
+        index = first_id + offset - 1
+        yield (first_id + offset, user_email(index), hashed_password, f"Bench User {index}", True, False)
+
+
+def generate_projects(first_id: int, first_user_id: int, users: int, per_user: int) -> Iterator[Tuple]:
+    project_id = first_id
+    for user_id in range(first_user_id, first_user_id + users):
+        for p in range(per_user):
+            yield (project_id, f"Project {user_id}-{p}", None, user_id)
+            project_id += 1
+
+
+def generate_tasks(
+    rng: random.Random,
+    first_id: int,
+    projects: Iterable[Tuple[int, int]],
+    user_ids: Sequence[int],
+    mean_tasks: float,
+    skew: float,
+    overdue_ratio: float,
+    assigned_ratio: float,
+    now: datetime,
+) -> Iterator[Tuple]:
+    """
+    Yield task rows for `(project_id, owner_id)` pairs. About half of the
+    assignments go to the project owner, the rest to random users.
+    """
+    statuses, status_weights = list(STATUS_WEIGHTS), list(accumulate(STATUS_WEIGHTS.values()))
+    priorities, priority_weights = list(PRIORITY_WEIGHTS), list(accumulate(PRIORITY_WEIGHTS.values()))
+    task_id = first_id
+    for project_id, owner_id in projects:
+        for _ in range(tasks_for_project(rng, mean_tasks, skew)):
+            status = rng.choices(statuses, cum_weights=status_weights)[0]
+            created_at = now - timedelta(days=rng.random() * 365)
+            updated_at = created_at + (now - created_at) * rng.random()
+            due_date = None
+            if rng.random() < 0.8:
+                if status != "DONE" and rng.random() < overdue_ratio:
+                    due_date = now - timedelta(days=rng.random() * 30 + 0.01)
+                else:
+                    due_date = now + timedelta(days=rng.random() * 60)
+            assigned_user_id = None
+            if rng.random() < assigned_ratio:
+                assigned_user_id = owner_id if rng.random() < 0.5 else rng.choice(user_ids)
+            priority = rng.choices(priorities, cum_weights=priority_weights)[0]
+            yield (
+                task_id, f"Task {task_id}", None, status, priority, PRIORITY_RANK[priority],
+                due_date, created_at, updated_at, project_id, assigned_user_id, owner_id,
+            )
+            task_id += 1
+
+
+def seed(
+    database_url: str,
+    users: int,
+    projects_per_user: int,
+    tasks_per_project: float,
+    seed: int = 42,
+    skew: float = 1.5,
+    overdue_ratio: float = 0.15,
+    assigned_ratio: float = 0.6,
+    batch_size: int = 10000,
+    create_schema: bool = True,
+    reference_time: Optional[datetime] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Seed the database and return rows and rows/second per table.
+    """
+    from app.core.security import get_password_hash
+    from app.db.base import Base
+
+    engine = create_engine(database_url)
+    if create_schema:
+        Base.metadata.create_all(bind=engine)
+
+    # Append after existing rows so seeding an existing database never collides
+    with engine.connect() as conn:
+        first_ids = {
+            name: (conn.execute(select(func.max(Base.metadata.tables[name].c.id))).scalar() or 0) + 1
+            for name in ("user", "project", "task")
+        }
+
+    rng = random.Random(seed)
+    now = reference_time or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Seeding is restartable, so trade durability for speed
+    loader = Loader(engine, durable=False)
+    stats: Dict[str, Dict[str, float]] = {}
+
+    def timed(table: str, columns: Sequence[str], rows: Iterable[Tuple]) -> None:
+        started = time.perf_counter()
+        count = loader.load(table, columns, rows, batch_size)
+        elapsed = time.perf_counter() - started
+        stats[table] = {"rows": count, "seconds": elapsed, "rows_per_second": count / elapsed if elapsed else 0.0}
+        print(f"{table:>8}: {count:>10} rows in {elapsed:7.1f}s ({stats[table]['rows_per_second']:,.0f} rows/s)")
+
+    try:
+        first_user = first_ids["user"]
+        timed("user", USER_COLUMNS, generate_users(first_user, users, get_password_hash(SEED_PASSWORD)))
+        timed("project", PROJECT_COLUMNS, generate_projects(first_ids["project"], first_user, users, projects_per_user))
+
+        owners = (
+            (first_ids["project"] + offset, first_user + offset // projects_per_user)
+            for offset in range(users * projects_per_user)
+        )
+        user_ids = range(first_user, first_user + users)
+        timed("task", TASK_COLUMNS, generate_tasks(
+            rng, first_ids["task"], owners, user_ids, tasks_per_project, skew,
+            overdue_ratio, assigned_ratio, now,
+        ))
+        loader.reset_sequences(["user", "project", "task"])
+    finally:
+        loader.close()
+        engine.dispose()
+
+    total_rows = sum(s["rows"] for s in stats.values())
+    total_seconds = sum(s["seconds"] for s in stats.values())
+    stats["total"] = {
+        "rows": total_rows,
+        "seconds": total_seconds,
+        "rows_per_second": total_rows / total_seconds if total_seconds else 0.0,
+    }
+    print(f"{'total':>8}: {total_rows:>10} rows in {total_seconds:7.1f}s ({stats['total']['rows_per_second']:,.0f} rows/s)")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--projects-per-user", type=int, default=5)
+    parser.add_argument("--tasks-per-project", type=float, default=40, help="Mean tasks per project")
+    parser.add_argument("--skew", type=float, default=1.5, help="Pareto shape for tasks per project; <= 1 disables skew")
+    parser.add_argument("--overdue-ratio", type=float, default=0.15, help="Share of open tasks that are overdue")
+    parser.add_argument("--assigned-ratio", type=float, default=0.6)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-create", action="store_true", help="Don't create missing tables first")
+    parser.add_argument(
+        "--reference-time",
+        type=datetime.fromisoformat,
+        help="ISO timestamp that generated dates are relative to (default: midnight UTC today)",
+    )
+    args = parser.parse_args()
+
+    seed(
+        args.database_url,
+        users=args.users,
+        projects_per_user=args.projects_per_user,
+        tasks_per_project=args.tasks_per_project,
+        seed=args.seed,
+        skew=args.skew,
+        overdue_ratio=args.overdue_ratio,
+        assigned_ratio=args.assigned_ratio,
+        batch_size=args.batch_size,
+        create_schema=not args.no_create,
+        reference_time=args.reference_time,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Read/write throughput on SQLite under concurrent API-style load: the
+previous engine setup (rollback journal, default pragmas and pool) versus
+the tuned profile from app.db.session.create_db_engine (WAL,
+synchronous=NORMAL, busy timeout, mmap and cache sizes, smaller pool).
+
+Each profile gets a freshly seeded database file. --processes worker
+processes (like uvicorn workers) each run --threads threads (like the
+AnyIO threadpool) that list an owner's tasks, update a task's status or
+create a task, one ORM session per operation as the endpoints do.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--processes 2] [--threads 8] \
+        [--duration 10] [--write-ratio 0.2]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+PROFILES = ("legacy", "tuned")
+STATUSES = ("TODO", "IN_PROGRESS", "DONE")
+
+
+def legacy_engine(url: str):
+    """
+    The SQLite engine as configured before the tuned profile.
+    """
+    from sqlalchemy import create_engine, event
+
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    return engine
+
+
+def run_process(profile: str, url: str, threads: int, duration: float, write_ratio: float, seed: int, results) -> None:
+    from sqlalchemy.orm import sessionmaker
+
+    from app import models
+    from app.db.session import create_db_engine
+
+    engine = legacy_engine(url) if profile == "legacy" else create_db_engine(url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as db:
+        projects: List[Tuple[int, int]] = db.query(models.Project.id, models.Project.owner_id).all()
+        max_task_id = db.query(models.Task.id).order_by(models.Task.id.desc()).limit(1).scalar()
+
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            project_id, owner_id = rng.choice(projects)
+            if rng.random() >= write_ratio:
+                kind = "read"
+            else:
+                kind = rng.choice(("update", "create"))
+            started = time.perf_counter()
+            db = Session()
+            try:
+                if kind == "read":
+                    db.query(models.Task).filter(models.Task.owner_id == owner_id).order_by(
+                        models.Task.priority_rank.desc(), models.Task.id.desc()
+                    ).limit(20).all()
+                elif kind == "update":
+                    task = db.get(models.Task, rng.randint(1, max_task_id))
+                    if task is not None:
+                        task.status = rng.choice(STATUSES)
+                        db.commit()
+                else:
+                    db.add(models.Task(title="bench", project_id=project_id, owner_id=owner_id))
+                    db.commit()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    samples[kind].append(elapsed)
+            except Exception:
+                db.rollback()
+                with lock:
+                    errors[kind] += 1
+            finally:
+                db.close()
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    engine.dispose()
+    results.put((dict(samples), dict(errors)))
+
+
+def measure(profile: str, args) -> None:
+    from benchmarks.seed import seed
+
+    directory = tempfile.mkdtemp(prefix=f"sqlite-{profile}-")
+    url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    seed(url, users=args.users, projects_per_user=5, tasks_per_project=args.tasks_per_project)
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=run_process,
+            args=(profile, url, args.threads, args.duration, args.write_ratio, index, results),
+        )
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for _ in processes:
+        process_samples, process_errors = results.get()
+        for kind, values in process_samples.items():
+            samples[kind].extend(values)
+        for kind, count in process_errors.items():
+            errors[kind] += count
+    for process in processes:
+        process.join()
+
+    print(f"\n{profile}")
+    print(f"{'operation':<10} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>9} {'errors':>7}")
+    for kind in ("read", "update", "create"):
+        values = sorted(samples.get(kind, []))
+        if not values:
+            print(f"{kind:<10} {0:>8} {'-':>8} {'-':>9} {errors.get(kind, 0):>7}")
+            continue
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(
+            f"{kind:<10} {len(values) / args.duration:>8.0f} {statistics.median(values) * 1000:>8.2f} "
+            f"{p99 * 1000:>9.1f} {errors.get(kind, 0):>7}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8, help="Threads per process")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per profile")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks-per-project", type=float, default=100)
+    args = parser.parse_args()
+
+    for profile in PROFILES:
+        measure(profile, args)
+
+
+if __name__ == "__main__":
+    main()
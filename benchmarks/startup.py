@@ -0,0 +1,81 @@
+"""
+Cold-start benchmark: time to import `app.main` and serve the first request.
+
+Each run happens in a fresh interpreter so nothing is cached between runs.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --database-url sqlite:///./bench.db
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Executed in a child interpreter; prints one JSON line with the timings
+CHILD_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    ready = time.perf_counter()
+    client.get("/")
+    first_request = time.perf_counter()
+    client.get("/health")
+    first_db_request = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_hook_ms": (ready - imported) * 1000,
+    "first_request_ms": (first_request - ready) * 1000,
+    "first_db_request_ms": (first_db_request - first_request) * 1000,
+    "total_ms": (first_db_request - start) * 1000,
+}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite:///./benchmark_startup.db")
+    parser.add_argument("--prewarm", type=int, default=0, help="DB_POOL_PREWARM for the child process")
+    parser.add_argument("--output", help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["DATABASE_URL"] = args.database_url
+    env["DB_POOL_PREWARM"] = str(args.prewarm)
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    summary = {
+        key: {
+            "median": statistics.median(run[key] for run in runs),
+            "min": min(run[key] for run in runs),
+            "max": max(run[key] for run in runs),
+        }
+        for key in runs[0]
+    }
+
+    for key, stats in summary.items():
+        print(f"{key:>22}: median {stats['median']:8.1f} ms  (min {stats['min']:.1f}, max {stats['max']:.1f})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": runs, "summary": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Query plans and latency of the task list query, joining project for the
+ownership check (before) versus filtering on the denormalized
+task.owner_id (after). Run it against a database seeded with
+benchmarks.seed.
+
+Usage:
+    python -m benchmarks.task_queries --database-url postgresql://localhost/bench \
+        [--owners 200] [--status TODO]
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from app import models
+
+
+def before(owner_id: int, status: str) -> Select:
+    return (
+        select(models.Task)
+        .join(models.Project)
+        .where(
+            models.Project.owner_id == owner_id,
+            models.Project.deleted_at.is_(None),
+            models.Task.status == status,
+        )
+        .order_by(models.Task.due_date)
+        .limit(10)
+    )
+
+
+def after(owner_id: int, status: str) -> Select:
+    deleted_projects = select(models.Project.id).where(
+        models.Project.owner_id == owner_id,
+        models.Project.deleted_at.is_not(None),
+    )
+    return (
+        select(models.Task)
+        .where(
+            models.Task.owner_id == owner_id,
+            models.Task.project_id.not_in(deleted_projects),
+            models.Task.status == status,
+        )
+        .order_by(models.Task.due_date)
+        .limit(10)
+    )
+
+
+def explain(connection: Connection, statement: Select) -> str:
+    compiled = statement.compile(connection, compile_kwargs={"literal_binds": True})
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}")).all()
+        return "\n".join(row[0] for row in rows)
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def measure(connection: Connection, build: Callable[[int, str], Select], owners: List[int], status: str) -> Dict[str, float]:
+    samples = []
+    for owner_id in owners:
+        started = time.perf_counter()
+        connection.execute(build(owner_id, status)).all()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[max(0, int(len(samples) * 0.95) - 1)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--owners", type=int, default=200, help="Owners to sample")
+    parser.add_argument("--status", default="TODO")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("ANALYZE task"))
+            connection.execute(text("ANALYZE project"))
+        else:
+            connection.execute(text("ANALYZE"))
+        max_owner = connection.execute(select(func.max(models.Project.owner_id))).scalar() or 0
+        rng = random.Random(args.seed)
+        owners = [rng.randint(1, max_owner) for _ in range(args.owners)] if max_owner else []
+        if not owners:
+            raise SystemExit("No projects found; seed the database first")
+
+        for name, build in (("before (join project)", before), ("after (task.owner_id)", after)):
+            print(f"== {name}")
+            print(explain(connection, build(owners[0], args.status)))
+            # Warm the cache, then time
+            measure(connection, build, owners[:20], args.status)
+            timings = measure(connection, build, owners, args.status)
+            print(f"p50 {timings['p50_ms']:.2f} ms  p95 {timings['p95_ms']:.2f} ms over {len(owners)} owners\n")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Per-task database overhead in forked worker processes, the way Celery's
+prefork pool runs tasks: children either keep the engine inherited from
+the parent (before) or run the worker_process_init hook that re-creates
+and pre-warms a pool of their own (after). Each simulated task opens a
+session, loads a task with its project and assignee, and closes it.
+
+Usage:
+    python -m benchmarks.worker_db --database-url postgresql://localhost/bench \
+        [--children 4] [--tasks 200]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from typing import Dict, List
+
+
+def run_child(mode: str, tasks: int, max_task_id: int, seed: int, results) -> None:
+    try:
+        results.put(time_tasks(mode, tasks, max_task_id, seed))
+    except Exception as e:
+        # Report instead of leaving the parent waiting on the queue
+        results.put(e)
+
+
+def time_tasks(mode: str, tasks: int, max_task_id: int, seed: int) -> List[float]:
+    from app import models
+    from app.db.session import session_scope
+
+    if mode == "after":
+        from app.worker import init_worker_process
+
+        init_worker_process()
+
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(tasks):
+        started = time.perf_counter()
+        with session_scope() as db:
+            task = db.query(models.Task).filter(models.Task.id == rng.randint(1, max_task_id)).first()
+            if task is not None:
+                task.project.name
+                task.assigned_user
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def measure(mode: str, children: int, tasks: int, max_task_id: int) -> Dict[str, float]:
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_child, args=(mode, tasks, max_task_id, seed, results))
+        for seed in range(children)
+    ]
+    for process in processes:
+        process.start()
+    per_child: List[List[float]] = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    for samples in per_child:
+        if isinstance(samples, Exception):
+            raise samples
+    first = [samples[0] for samples in per_child]
+    steady = sorted(sample for samples in per_child for sample in samples[1:])
+    return {
+        "first_task_ms": statistics.mean(first) * 1000,
+        "p50_ms": statistics.median(steady) * 1000,
+        "p95_ms": steady[max(0, int(len(steady) * 0.95) - 1)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--children", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks per child")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import func
+
+    from app import models
+    from app.db.session import session_scope
+
+    # The parent uses the engine before forking, as the Celery main process does
+    with session_scope() as db:
+        max_task_id = db.query(func.max(models.Task.id)).scalar() or 0
+    if not max_task_id:
+        raise SystemExit("No tasks found; seed the database first")
+
+    for mode in ("before", "after"):
+        timings = measure(mode, args.children, args.tasks, max_task_id)
+        print(
+            f"{mode:>6}: first task {timings['first_task_ms']:6.2f} ms  "
+            f"then p50 {timings['p50_ms']:.2f} ms  p95 {timings['p95_ms']:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import axios from 'axios';
 
-const API_URL = 'https://software-engineer-intern-role-at-macv-ai-production.up.railway.app/';
+// Build with VITE_API_URL=/api when the API serves the frontend itself
+const API_URL =
+  import.meta.env.VITE_API_URL ?? 'https://software-engineer-intern-role-at-macv-ai-production.up.railway.app/';
 
 const api = axios.create({
   baseURL: API_URL,
@@ -50,6 +50,7 @@ echo "SECRET_KEY=$secret_key"
 echo "ACCESS_TOKEN_EXPIRE_MINUTES=60"
 echo "ALGORITHM=HS256"
 echo "BACKEND_CORS_ORIGINS=*"
+echo "TRUSTED_PROXIES=*"
 
 echo "\n✅ Environment variables setup complete!\n"
 echo "Copy these variables to your Railway dashboard as instructed above.\n"